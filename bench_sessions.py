@@ -0,0 +1,139 @@
+"""Session memory benchmark: per-session state held for logged-in users.
+
+Builds --sessions concurrent developer sessions the way main5.py does after
+login: a SessionUser, a signed token from issue_session_token and the
+per-session doubt state (DoubtView records, unread replies and feed
+cursors). tracemalloc measures them against the original session record,
+users_df.iloc[0].to_dict() from a pandas users table.
+
+    python bench_sessions.py                  # exits 1 if the budget is exceeded
+    python bench_sessions.py --sessions 20000 --doubts 10
+"""
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+from datetime import datetime
+
+import pandas as pd
+
+# Budget for everything one developer session keeps, in bytes
+SESSION_BUDGET_BYTES = 3072
+
+def make_users(count):
+    """A users table shaped like users.csv, read back the way the original code did"""
+    now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    return pd.DataFrame({
+        'user_id': [f"dev{index:05d}" for index in range(count)],
+        'name': [f"Developer {index}" for index in range(count)],
+        'team_number': [index % 10 + 1 for index in range(count)],
+        'registration_date': [now] * count,
+    })
+
+def make_doubt_rows(user_id, team_number, count):
+    """Full doubt rows for one developer, as read from a doubts shard"""
+    now = datetime.now()
+    return [{
+        'doubt_id': index + 1, 'user_id': user_id, 'name': f"Developer {user_id}",
+        'team_number': team_number, 'doubt_text': f"How do I get access to the staging {index} database?",
+        'priority': 'Medium', 'status': 'Replied' if index % 2 else 'Open',
+        'reply_message': 'Ask the platform team for a key' if index % 2 else float('nan'),
+        'date': now.strftime('%Y-%m-%d'), 'timestamp': now.strftime('%Y-%m-%d %H:%M:%S'),
+    } for index in range(count)]
+
+def measure(build):
+    """Return (bytes allocated and still live, result) for build()"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before, result
+
+def build_original_sessions(users_df):
+    """Session state as the original app kept it: the whole pandas row as a dict"""
+    return [
+        {'logged_in': True, 'user_data': users_df.iloc[index].to_dict()}
+        for index in range(len(users_df))
+    ]
+
+def build_sessions(app, users_df, doubt_rows):
+    """Session state as main5.py keeps it for a developer on the doubts page"""
+    sessions = []
+    for index, row in enumerate(users_df.to_dict('records')):
+        user = app.SessionUser.from_row(row)
+        rows = doubt_rows[index]
+        sessions.append({
+            'logged_in': True,
+            'user_data': user,
+            'auth_token': app.issue_session_token(user.user_id),
+            'my_doubts': {
+                int(doubt['doubt_id']): app.DoubtView.from_row(doubt)
+                for doubt in rows
+            },
+            'doubts_owner': user.user_id,
+            'doubts_seq': index,
+            'unread_replies': {2},
+            'replies_owner': user.user_id,
+            'replies_seq': index,
+        })
+    return sessions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=5000, help="concurrent sessions to build")
+    parser.add_argument("--doubts", type=int, default=5, help="doubts kept per session")
+    parser.add_argument("--budget", type=int, default=SESSION_BUDGET_BYTES, help="bytes per session")
+    args = parser.parse_args()
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import main5 as app
+
+    users_df = make_users(args.sessions)
+    doubt_rows = [
+        make_doubt_rows(row['user_id'], row['team_number'], args.doubts)
+        for row in users_df.to_dict('records')
+    ]
+    # Sign once up front so the key's one-off allocation is not charged to the sessions
+    app.issue_session_token('warmup')
+
+    original_bytes, original = measure(lambda: build_original_sessions(users_df))
+    current_bytes, current = measure(lambda: build_sessions(app, users_df, doubt_rows))
+    user_bytes, users = measure(lambda: [
+        (app.SessionUser.from_row(row), app.issue_session_token(row['user_id']))
+        for row in users_df.to_dict('records')
+    ])
+    full_row_bytes, full_rows = measure(lambda: [
+        {int(doubt['doubt_id']): dict(doubt) for doubt in rows}
+        for rows in doubt_rows
+    ])
+    view_bytes, views = measure(lambda: [
+        {int(doubt['doubt_id']): app.DoubtView.from_row(doubt) for doubt in rows}
+        for rows in doubt_rows
+    ])
+
+    count = args.sessions
+    print(f"Sessions: {count}, {args.doubts} doubts each")
+    print(f"Original user record (iloc row dict): {original_bytes / count:8.0f} B/session")
+    print(f"SessionUser + signed token:           {user_bytes / count:8.0f} B/session")
+    print(f"Doubt state as full rows:             {full_row_bytes / count:8.0f} B/session")
+    print(f"Doubt state as DoubtView:             {view_bytes / count:8.0f} B/session")
+    print(f"Current session total:                {current_bytes / count:8.0f} B/session (budget {args.budget} B)")
+
+    failures = []
+    if user_bytes > original_bytes:
+        failures.append(f"SessionUser + token uses more than the original row dict ({user_bytes} > {original_bytes} B)")
+    if view_bytes > full_row_bytes:
+        failures.append(f"DoubtView state uses more than full rows ({view_bytes} > {full_row_bytes} B)")
+    if current_bytes / count > args.budget:
+        failures.append(f"session state {current_bytes / count:.0f} B/session over budget {args.budget} B")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,528 @@
+"""Storage consistency and performance regression check.
+
+Consistency: seeded, randomly generated operation sequences (register,
+standup, doubt, reply, resolve, team change) run from several threads at
+once against the sharded storage in main5.py. The same sequences then run
+one at a time against ReferenceStore, the original single-file CSV
+implementation. Per-team users, standups, doubts and cached dashboard
+queries must match, and ids must not repeat within or across shards.
+
+Contention: threads share a few users and doubts, so replies race resolves
+on the same doubt and team changes race standups by the same user. Every
+write must land exactly once, in its team's shard, and each final value must
+be one that some serial order of the operations produces.
+
+Performance: shards are seeded with --rows standups and the latency of
+writes and dashboard queries is compared against the budgets below. Write,
+warm query and all-teams budgets are relative to baselines measured in the
+same run: the original single-file write and export, and the cold query.
+
+    python bench_storage.py                    # exits 1 on any mismatch or regression
+    python bench_storage.py --examples 50 --rows 20000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, datetime
+
+import pandas as pd
+
+# Latency budgets at the benchmark row count. Relative budgets are scaled from
+# baselines measured in the same run, so they hold across machines.
+TEAM_QUERY_COLD_BUDGET_MS = 150
+# A write, as a share of the original write (pandas read + concat + to_csv of
+# the single standups file); rewriting even one shard with pandas exceeds it
+WRITE_BASELINE_FRACTION = 0.02
+# A repeated team query, as a share of the same query on a cold cache
+TEAM_QUERY_WARM_FRACTION = 0.1
+# All-teams query + CSV, as a multiple of the original single-file read + CSV
+ALL_TEAMS_QUERY_BASELINE_FACTOR = 2.0
+
+# IDs are read as text: the original read them as numbers, which turned "007"
+# into 7 once a team change rewrote users.csv
+ID_DTYPES = {'user_id': str}
+
+TEAMS = list(range(1, 11))
+WORDS = "staging deploy api review tests login build cache docs database keys access".split()
+
+class ReferenceStore:
+    """The original CSV storage: one file per table, rewritten with pandas on every write
+
+    The only departure from the original is reading user_id as text (ID_DTYPES).
+    """
+
+    def __init__(self, directory):
+        self.users_csv = os.path.join(directory, "users.csv")
+        self.standups_csv = os.path.join(directory, "standups.csv")
+        self.doubts_csv = os.path.join(directory, "doubts.csv")
+        pd.DataFrame(columns=['user_id', 'name', 'team_number', 'registration_date']).to_csv(self.users_csv, index=False)
+        pd.DataFrame(columns=[
+            'submission_id', 'user_id', 'name', 'team_number',
+            'date', 'yesterday_work', 'today_plan', 'blockers', 'timestamp'
+        ]).to_csv(self.standups_csv, index=False)
+        pd.DataFrame(columns=[
+            'doubt_id', 'user_id', 'name', 'team_number',
+            'doubt_text', 'priority', 'status', 'reply_message', 'date', 'timestamp'
+        ]).to_csv(self.doubts_csv, index=False)
+
+    def save_user(self, user_id, name, team_number):
+        users_df = pd.read_csv(self.users_csv, dtype=ID_DTYPES)
+        new_user = pd.DataFrame({
+            'user_id': [user_id], 'name': [name], 'team_number': [team_number],
+            'registration_date': [datetime.now().strftime('%Y-%m-%d %H:%M:%S')]
+        })
+        pd.concat([users_df, new_user], ignore_index=True).to_csv(self.users_csv, index=False)
+
+    def change_user_team(self, user_id, new_team):
+        users_df = pd.read_csv(self.users_csv, dtype=ID_DTYPES)
+        users_df.loc[users_df['user_id'] == user_id, 'team_number'] = new_team
+        users_df.to_csv(self.users_csv, index=False)
+
+    def save_standup(self, user, yesterday_work, today_plan, blockers):
+        standups_df = pd.read_csv(self.standups_csv, dtype=ID_DTYPES)
+        new_standup = pd.DataFrame({
+            'submission_id': [len(standups_df) + 1], 'user_id': [user.user_id], 'name': [user.name],
+            'team_number': [user.team_number], 'date': [date.today().strftime('%Y-%m-%d')],
+            'yesterday_work': [yesterday_work], 'today_plan': [today_plan], 'blockers': [blockers],
+            'timestamp': [datetime.now().strftime('%Y-%m-%d %H:%M:%S')]
+        })
+        pd.concat([standups_df, new_standup], ignore_index=True).to_csv(self.standups_csv, index=False)
+
+    def save_doubt(self, user, doubt_text, priority):
+        doubts_df = pd.read_csv(self.doubts_csv, dtype=ID_DTYPES)
+        doubt_id = len(doubts_df) + 1
+        new_doubt = pd.DataFrame({
+            'doubt_id': [doubt_id], 'user_id': [user.user_id], 'name': [user.name],
+            'team_number': [user.team_number], 'doubt_text': [doubt_text], 'priority': [priority],
+            'status': ['Open'], 'reply_message': [""], 'date': [date.today().strftime('%Y-%m-%d')],
+            'timestamp': [datetime.now().strftime('%Y-%m-%d %H:%M:%S')]
+        })
+        pd.concat([doubts_df, new_doubt], ignore_index=True).to_csv(self.doubts_csv, index=False)
+        return doubt_id
+
+    def update_doubt(self, doubt_id, updates):
+        doubts_df = pd.read_csv(self.doubts_csv, dtype=ID_DTYPES)
+        doubt_index = doubts_df[doubts_df['doubt_id'] == doubt_id].index
+        if len(doubt_index) == 0:
+            return False
+        for column, value in updates.items():
+            doubts_df[column] = doubts_df[column].astype(object)
+            doubts_df.loc[doubt_index[0], column] = value
+        doubts_df.to_csv(self.doubts_csv, index=False)
+        return True
+
+    def update_doubt_reply(self, doubt_id, reply_message, lead_name):
+        return self.update_doubt(doubt_id, {'reply_message': f"[{lead_name}]: {reply_message}", 'status': 'Replied'})
+
+    def resolve_doubt(self, doubt_id):
+        return self.update_doubt(doubt_id, {'status': 'Resolved'})
+
+def make_user_id(rng, owner, number):
+    """A user id unique to (owner, number): text, numeric, or numeric with leading zeros"""
+    kind = rng.choice(['text', 'numeric', 'leading_zero'])
+    if kind == 'text':
+        return f"t{owner}u{number}"
+    if kind == 'numeric':
+        return f"{owner + 1}{number:03d}"
+    return f"0{owner:02d}{number:03d}"
+
+def generate_operations(rng, thread_index, length):
+    """One thread's operations; each thread owns its users and doubts, so threads commute"""
+    operations = []
+    users = 0
+    doubts = 0
+    for _ in range(length):
+        kind = rng.choice(['register', 'standup', 'standup', 'doubt', 'doubt', 'reply', 'resolve', 'change_team'])
+        if kind == 'register' or users == 0:
+            operations.append(('register', make_user_id(rng, thread_index, users), f"User {thread_index}-{users}", rng.choice(TEAMS)))
+            users += 1
+        elif kind == 'standup':
+            blockers = " ".join(rng.sample(WORDS, rng.randint(0, 3)))
+            operations.append(('standup', rng.randrange(users), " ".join(rng.sample(WORDS, 3)), "plan, \"quoted\"\nline", blockers))
+        elif kind == 'doubt':
+            operations.append(('doubt', rng.randrange(users), " ".join(rng.sample(WORDS, 4)), rng.choice(["Low", "Medium", "High"])))
+            doubts += 1
+        elif kind in ('reply', 'resolve') and doubts:
+            operations.append((kind, rng.randrange(doubts), " ".join(rng.sample(WORDS, 2))))
+        elif kind == 'change_team':
+            operations.append(('change_team', rng.randrange(users), rng.choice(TEAMS)))
+    return operations
+
+def apply_operations(app, store, operations):
+    """Run operations against main5 (store is None) or the reference store"""
+    users = []
+    doubts = []
+    for operation in operations:
+        kind = operation[0]
+        if kind == 'register':
+            _, user_id, name, team_number = operation
+            (store or app).save_user(user_id, name, team_number)
+            users.append(app.SessionUser(user_id, name, team_number))
+        elif kind == 'standup':
+            _, user_index, yesterday_work, today_plan, blockers = operation
+            (store or app).save_standup(users[user_index], yesterday_work, today_plan, blockers)
+        elif kind == 'doubt':
+            _, user_index, doubt_text, priority = operation
+            if store:
+                doubts.append(store.save_doubt(users[user_index], doubt_text, priority))
+            else:
+                doubt = app.save_doubt(users[user_index], doubt_text, priority)
+                doubts.append((doubt['doubt_id'], doubt['team_number']))
+        elif kind == 'reply':
+            _, doubt_index, message = operation
+            if store:
+                store.update_doubt_reply(doubts[doubt_index], message, "Lead")
+            else:
+                app.update_doubt_reply(*doubts[doubt_index], message, "Lead")
+        elif kind == 'resolve':
+            _, doubt_index, _ = operation
+            if store:
+                store.resolve_doubt(doubts[doubt_index])
+            else:
+                app.resolve_doubt(*doubts[doubt_index])
+        elif kind == 'change_team':
+            _, user_index, new_team = operation
+            user = users[user_index]
+            (store or app).change_user_team(user.user_id, new_team)
+            user.team_number = new_team
+
+def generate_contended_operations(rng, thread_index, length, users, doubts):
+    """One thread's operations on users and doubts shared with every other thread"""
+    operations = []
+    for number in range(length):
+        tag = f"c{thread_index}-{number}"
+        kind = rng.choice(['standup', 'standup', 'change_team', 'reply', 'reply', 'resolve', 'doubt', 'register'])
+        if kind in ('standup', 'doubt'):
+            operations.append((kind, rng.randrange(users), tag))
+        elif kind == 'change_team':
+            operations.append(('change_team', rng.randrange(users), rng.choice(TEAMS)))
+        elif kind in ('reply', 'resolve'):
+            operations.append((kind, rng.randrange(doubts), tag))
+        else:
+            operations.append(('register', make_user_id(rng, thread_index, number), tag, rng.choice(TEAMS)))
+    return operations
+
+def apply_contended_operations(app, operations, users, doubts):
+    """Run contended operations against main5; users are SessionUsers shared between threads"""
+    for operation in operations:
+        kind = operation[0]
+        if kind == 'standup':
+            _, user_index, tag = operation
+            app.save_standup(users[user_index], tag, "plan", "")
+        elif kind == 'doubt':
+            _, user_index, tag = operation
+            app.save_doubt(users[user_index], tag, "Low")
+        elif kind == 'change_team':
+            _, user_index, new_team = operation
+            user = users[user_index]
+            app.change_user_team(user.user_id, new_team)
+            user.team_number = new_team
+        elif kind == 'reply':
+            _, doubt_index, tag = operation
+            app.update_doubt_reply(*doubts[doubt_index], tag, "Lead")
+        elif kind == 'resolve':
+            _, doubt_index, _ = operation
+            app.resolve_doubt(*doubts[doubt_index])
+        elif kind == 'register':
+            _, user_id, name, team_number = operation
+            app.save_user(user_id, name, team_number)
+
+def duplicate_ids(app, table):
+    """Ids that repeat within a shard or across the shards of a table"""
+    id_column = app.TABLE_ID_COLUMNS[table]
+    problems = []
+    owners = {}
+    for shard in app.list_shards(table):
+        ids = app.read_shard(table, shard)[id_column]
+        if ids.duplicated().any():
+            problems.append(f"{table} ids repeat within {shard}: {sorted(set(ids[ids.duplicated()]))}")
+        for row_id in set(ids):
+            if row_id in owners:
+                problems.append(f"{table} id {row_id} is in both {owners[row_id]} and {shard}")
+            owners[row_id] = shard
+    return problems
+
+def normalized(df, columns):
+    """Order-independent, NaN-free view of selected columns"""
+    if df.empty:
+        return []
+    values = df[columns].astype(object).where(df[columns].notna(), "")
+    return sorted(tuple(str(value) for value in row) for row in values.itertuples(index=False))
+
+def check_consistency(app, examples, threads, length, seed):
+    """Compare main5 storage with the reference across generated examples; returns failures"""
+    failures = []
+    standup_columns = ['user_id', 'name', 'team_number', 'yesterday_work', 'today_plan', 'blockers']
+    doubt_columns = ['user_id', 'name', 'team_number', 'doubt_text', 'priority', 'status', 'reply_message']
+    for example in range(examples):
+        rng = random.Random(seed + example)
+        sequences = [generate_operations(rng, thread_index, length) for thread_index in range(threads)]
+        with tempfile.TemporaryDirectory() as app_dir, tempfile.TemporaryDirectory() as ref_dir:
+            os.chdir(app_dir)
+            # A fresh directory is a new run as far as the per-run shard listings go
+            app.reset_run_versions()
+            app.init_csv_files()
+            workers = [
+                threading.Thread(target=apply_operations, args=(app, None, sequence))
+                for sequence in sequences
+            ]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+
+            reference = ReferenceStore(ref_dir)
+            for sequence in sequences:
+                apply_operations(app, reference, sequence)
+
+            ref_standups = pd.read_csv(reference.standups_csv, dtype=ID_DTYPES)
+            ref_doubts = pd.read_csv(reference.doubts_csv, dtype=ID_DTYPES)
+            checks = {
+                'users': (
+                    normalized(app.load_users(), ['user_id', 'name', 'team_number']),
+                    normalized(pd.read_csv(reference.users_csv, dtype=ID_DTYPES), ['user_id', 'name', 'team_number'])
+                ),
+                'standups': (
+                    normalized(app.cached_query(app.STANDUPS_TABLE), standup_columns),
+                    normalized(ref_standups, standup_columns)
+                )
+            }
+            for team_number in TEAMS:
+                for status in ('Open', 'Replied', 'Resolved'):
+                    checks[f'team {team_number} {status} doubts'] = (
+                        normalized(app.cached_query(app.DOUBTS_TABLE, [team_number], status=status), doubt_columns),
+                        normalized(ref_doubts[(ref_doubts['team_number'] == team_number) & (ref_doubts['status'] == status)], doubt_columns)
+                    )
+            for name, (actual, expected) in checks.items():
+                if actual != expected:
+                    failures.append(f"example {example} (seed {seed + example}): {name} differ")
+            for table in (app.STANDUPS_TABLE, app.DOUBTS_TABLE):
+                for problem in duplicate_ids(app, table):
+                    failures.append(f"example {example} (seed {seed + example}): {problem}")
+            os.chdir(os.path.dirname(app_dir))
+    return failures
+
+def check_contention(app, examples, threads, length, seed, shared=3):
+    """Race threads on shared users and doubts and check every outcome is serializable"""
+    failures = []
+    for example in range(examples):
+        rng = random.Random(seed + example)
+        label = f"contention {example} (seed {seed + example})"
+        with tempfile.TemporaryDirectory() as app_dir:
+            os.chdir(app_dir)
+            app.reset_run_versions()
+            app.init_csv_files()
+
+            # Shared users and one doubt each, set up before the threads start
+            users = []
+            doubts = []
+            for number in range(shared):
+                user = app.SessionUser(make_user_id(rng, threads, number), f"Shared {number}", rng.choice(TEAMS))
+                app.save_user(user.user_id, user.name, user.team_number)
+                doubt = app.save_doubt(user, f"shared-{number}", "High")
+                users.append(user)
+                doubts.append((doubt['doubt_id'], doubt['team_number']))
+            initial_teams = [user.team_number for user in users]
+
+            sequences = [
+                generate_contended_operations(rng, thread_index, length, shared, shared)
+                for thread_index in range(threads)
+            ]
+            workers = [
+                threading.Thread(target=apply_contended_operations, args=(app, sequence, users, doubts))
+                for sequence in sequences
+            ]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+
+            # Outcomes some serial order allows: the final value comes from the last
+            # operation of one of the threads that touched the entity
+            teams_held = [{team} for team in initial_teams]
+            final_teams = [set() for _ in users]
+            final_statuses = [set() for _ in doubts]
+            final_replies = [set() for _ in doubts]
+            expected_users = {user.user_id: {team} for user, team in zip(users, initial_teams)}
+            expected_rows = {}
+            for sequence in sequences:
+                last_team = {}
+                last_status = {}
+                last_reply = {}
+                for operation in sequence:
+                    kind = operation[0]
+                    if kind == 'change_team':
+                        teams_held[operation[1]].add(operation[2])
+                        last_team[operation[1]] = operation[2]
+                    elif kind in ('reply', 'resolve'):
+                        last_status[operation[1]] = 'Replied' if kind == 'reply' else 'Resolved'
+                        if kind == 'reply':
+                            last_reply[operation[1]] = f"[Lead]: {operation[2]}"
+                    elif kind in ('standup', 'doubt'):
+                        expected_rows[operation[2]] = (kind, operation[1])
+                    elif kind == 'register':
+                        expected_users[operation[1]] = {operation[3]}
+                for index, team in last_team.items():
+                    final_teams[index].add(team)
+                for index, status in last_status.items():
+                    final_statuses[index].add(status)
+                for index, reply in last_reply.items():
+                    final_replies[index].add(reply)
+            for index, user in enumerate(users):
+                expected_users[user.user_id] = final_teams[index] or {initial_teams[index]}
+
+            users_df = app.load_users()
+            counts = users_df['user_id'].value_counts()
+            for user_id, teams in expected_users.items():
+                if counts.get(user_id, 0) != 1:
+                    failures.append(f"{label}: user {user_id!r} stored {counts.get(user_id, 0)} times")
+                    continue
+                team = int(users_df.loc[users_df['user_id'] == user_id, 'team_number'].iloc[0])
+                if team not in teams:
+                    failures.append(f"{label}: user {user_id!r} ended in team {team}, expected one of {sorted(teams)}")
+
+            # Per-team queries only read that team's shard, so each row must turn up there exactly once
+            seen_rows = {}
+            for team_number in TEAMS:
+                for table, text_column in ((app.STANDUPS_TABLE, 'yesterday_work'), (app.DOUBTS_TABLE, 'doubt_text')):
+                    for row in app.cached_query(table, [team_number]).to_dict('records'):
+                        seen_rows.setdefault(row[text_column], []).append(row)
+            for tag, (kind, user_index) in expected_rows.items():
+                rows = seen_rows.get(tag, [])
+                if len(rows) != 1:
+                    failures.append(f"{label}: {kind} {tag} found {len(rows)} times")
+                elif int(rows[0]['team_number']) not in teams_held[user_index]:
+                    failures.append(f"{label}: {kind} {tag} filed under team {rows[0]['team_number']}, "
+                                    f"which its user never held")
+                elif rows[0]['user_id'] != users[user_index].user_id:
+                    failures.append(f"{label}: {kind} {tag} has user {rows[0]['user_id']!r}")
+            for index in range(shared):
+                rows = seen_rows.get(f"shared-{index}", [])
+                if len(rows) != 1:
+                    failures.append(f"{label}: shared doubt {index} found {len(rows)} times")
+                    continue
+                status = rows[0]['status']
+                reply = rows[0]['reply_message'] if isinstance(rows[0]['reply_message'], str) else ""
+                if status not in (final_statuses[index] or {'Open'}):
+                    failures.append(f"{label}: shared doubt {index} is {status}, expected one of {sorted(final_statuses[index])}")
+                if reply not in (final_replies[index] or {""}):
+                    failures.append(f"{label}: shared doubt {index} has reply {reply!r}, expected one of {sorted(final_replies[index])}")
+            for table in (app.STANDUPS_TABLE, app.DOUBTS_TABLE):
+                for problem in duplicate_ids(app, table):
+                    failures.append(f"{label}: {problem}")
+            os.chdir(os.path.dirname(app_dir))
+    return failures
+
+def seed_shards(app, rows):
+    """Write rows standups spread over TEAMS straight into shard files"""
+    today = date.today().strftime('%Y-%m-%d')
+    per_team = rows // len(TEAMS)
+    for offset, team_number in enumerate(TEAMS):
+        path = app.shard_path(app.STANDUPS_TABLE, app.shard_for_team(team_number))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Ids are unique across shards, as the app allocates them
+        first_id = offset * per_team + 1
+        pd.DataFrame({
+            'submission_id': range(first_id, first_id + per_team),
+            'user_id': [f"u{team_number}_{i % 50}" for i in range(per_team)],
+            'name': [f"User {i % 50}" for i in range(per_team)],
+            'team_number': team_number,
+            'date': [today if i % 20 == 0 else '2026-01-01' for i in range(per_team)],
+            'yesterday_work': "worked on the api",
+            'today_plan': "review and deploy",
+            'blockers': "staging environment down",
+            'timestamp': f"{today} 09:00:00"
+        }).to_csv(path, index=False)
+
+def timed_ms(function, repeat, setup=None):
+    """Median milliseconds per call, running the untimed setup before each call"""
+    samples = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+def check_performance(app, rows):
+    """Measure write and query latency at the given row count; returns failures"""
+    with tempfile.TemporaryDirectory() as app_dir, tempfile.TemporaryDirectory() as ref_dir:
+        os.chdir(app_dir)
+        app.reset_run_versions()
+        app.init_csv_files()
+        seed_shards(app, rows)
+        today = date.today().strftime('%Y-%m-%d')
+        user = app.SessionUser("bench", "Bench User", TEAMS[0])
+        # A write makes the next query of that shard (and of all teams) a cache miss
+        write = lambda: app.save_standup(user, "bench", "bench", "staging down")
+        team_query = lambda: app.cached_query(app.STANDUPS_TABLE, [TEAMS[0]], date=today)
+        app.query_all(app.STANDUPS_TABLE)
+        # The first write seeds the id allocator from the shards
+        write()
+
+        # Baselines: the original app kept every standup in one CSV, rewrote it on
+        # each standup and exported it whole
+        reference = ReferenceStore(ref_dir)
+        app.query_all(app.STANDUPS_TABLE).to_csv(reference.standups_csv, index=False)
+        reference_write_ms = timed_ms(lambda: reference.save_standup(user, "bench", "bench", "staging down"), 3)
+        reference_export_ms = timed_ms(lambda: pd.read_csv(reference.standups_csv).to_csv(index=False), 3)
+        print(f"original write: {reference_write_ms:.1f} ms, single-file read + CSV: {reference_export_ms:.1f} ms")
+
+        cold_query_ms = timed_ms(team_query, 10, setup=write)
+        results = {
+            'write (save_standup)': (timed_ms(write, 20), WRITE_BASELINE_FRACTION * reference_write_ms),
+            'team query, cold': (cold_query_ms, TEAM_QUERY_COLD_BUDGET_MS),
+            'team query, warm': (timed_ms(team_query, 50), TEAM_QUERY_WARM_FRACTION * cold_query_ms),
+            'all teams query + CSV, cold': (
+                timed_ms(lambda: app.cached_csv(app.STANDUPS_TABLE), 3, setup=write),
+                ALL_TEAMS_QUERY_BASELINE_FACTOR * reference_export_ms
+            )
+        }
+        os.chdir(os.path.dirname(app_dir))
+
+    failures = []
+    for name, (elapsed, budget) in results.items():
+        print(f"{name}: {elapsed:.3f} ms (budget {budget:.3f} ms)")
+        if elapsed > budget:
+            failures.append(f"{name} took {elapsed:.3f} ms, over its {budget:.3f} ms budget")
+    return failures
+
+class IdleBlockerWorker:
+    """Stands in for the blocker trend thread, whose clustering would run inside the timings"""
+
+    def submit(self, row):
+        pass
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--examples", type=int, default=20, help="generated examples to check")
+    parser.add_argument("--threads", type=int, default=4, help="concurrent threads per example")
+    parser.add_argument("--length", type=int, default=25, help="operations per thread")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first example")
+    parser.add_argument("--rows", type=int, default=100_000, help="standup rows for the benchmark")
+    args = parser.parse_args()
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import main5 as app
+
+    app.get_blocker_worker = IdleBlockerWorker
+
+    failures = check_consistency(app, args.examples, args.threads, args.length, args.seed)
+    print(f"Consistency: {args.examples} examples, {len(failures)} failure(s)")
+    contention_failures = check_contention(app, args.examples, args.threads, args.length, args.seed)
+    print(f"Contention: {args.examples} examples, {len(contention_failures)} failure(s)")
+    failures += contention_failures
+    failures += check_performance(app, args.rows)
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
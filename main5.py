@@ -1,11 +1,30 @@
 import streamlit as st
-import pandas as pd
 import os
 from datetime import datetime, date
 import json
+import logging
+import csv
+import re
+import hashlib
+import hmac
+import inspect
+import queue
+import secrets
+import sys
+import threading
+import time
+import zlib
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 
-# Configuration
-TEAMS_CONFIG = {
+logger = logging.getLogger(__name__)
+
+# pandas and numpy are imported inside the functions that use them, so the
+# login page can render on a cold start without paying for the imports
+
+# Teams seeded into teams.csv on first start; edit teams.csv to add or change teams
+DEFAULT_TEAMS_CONFIG = {
     1: {"lead_name": "SATWIK RAKHELKAR"},
     2: {"lead_name": "SRIKAR GADAGOJU"},
     3: {"lead_name": "PUNEETH PEELA"},
@@ -18,130 +37,1123 @@ TEAMS_CONFIG = {
     10: {"lead_name": "GANNARAM DHRUV"}
 }
 
+# Hierarchy placement for teams.csv rows that leave org or department empty
+DEFAULT_ORG = "Default Org"
+DEFAULT_DEPARTMENT = "Engineering"
+
 # CSV file paths
+TEAMS_CSV = "teams.csv"
 USERS_CSV = "users.csv"
+# Pre-sharding files; migrated into shards on first start, then renamed
 STANDUPS_CSV = "standups.csv"
 DOUBTS_CSV = "doubts.csv"
 
-def get_team_lead_password(team_number):
-    """Get tech lead password from Streamlit secrets"""
+# Standups and doubts are sharded into SHARDS_DIR/<shard>/<table>.csv.
+# SHARD_BY is "team" (one shard per team) or "org" (one shard per teams.csv org);
+# changing it does not move existing shard files.
+SHARDS_DIR = "shards"
+SHARD_BY = "team"
+# In org mode a team keeps the shard it was first written to, even if its org is
+# edited later; the assignments are kept here
+TEAM_SHARDS_CSV = os.path.join(SHARDS_DIR, "team_shards.csv")
+STANDUPS_TABLE = "standups"
+DOUBTS_TABLE = "doubts"
+# users.csv is not sharded, but is queried through the same cache
+USERS_TABLE = "users"
+# Worker threads for queries that fan out across shards
+SHARD_QUERY_WORKERS = 8
+
+# Memory cap for cached dashboard query results and CSV payloads
+QUERY_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Blocker clustering: hashed TF-IDF features, the cosine similarity a blocker
+# needs to join an existing cluster, the most clusters a day or week keeps
+# (4 KB of centroid each), rows vectorized per batch, and how many days of
+# day/week clusters are kept
+BLOCKER_FEATURES = 2 ** 10
+BLOCKER_SIMILARITY = 0.35
+BLOCKER_MAX_CLUSTERS = 100
+BLOCKER_BATCH_SIZE = 256
+BLOCKER_RETENTION_DAYS = 56
+BLOCKER_STOPWORDS = frozenset("""
+    a about after all also am an and any are as at be been being blocked blocker
+    blockers but by can cannot could currently did do does doing done dont for
+    from get getting got had has have having i im in into is issue issues it its
+    just me my na nil no none not nothing now of on or our so some still that the
+    their them there this to today too until up us was we were what when which
+    while will with without would yesterday yet you
+""".split())
+
+# CSV columns
+USER_COLUMNS = ['user_id', 'name', 'team_number', 'registration_date']
+STANDUP_COLUMNS = [
+    'submission_id', 'user_id', 'name', 'team_number',
+    'date', 'yesterday_work', 'today_plan', 'blockers', 'timestamp'
+]
+DOUBT_COLUMNS = [
+    'doubt_id', 'user_id', 'name', 'team_number',
+    'doubt_text', 'priority', 'status', 'reply_message', 'date', 'timestamp'
+]
+TABLE_COLUMNS = {STANDUPS_TABLE: STANDUP_COLUMNS, DOUBTS_TABLE: DOUBT_COLUMNS}
+TABLE_ID_COLUMNS = {STANDUPS_TABLE: 'submission_id', DOUBTS_TABLE: 'doubt_id'}
+
+# Session tokens stay valid for one working day
+SESSION_TOKEN_TTL = 12 * 60 * 60
+
+# Number of recent doubt changes kept in the in-memory change feed
+CHANGE_FEED_SIZE = 5000
+# Seconds between change feed polls on auto-refreshing pages
+FEED_POLL_INTERVAL = 10
+
+# st.fragment is only available in newer Streamlit releases
+_fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+# Expanders only report being opened in newer Streamlit releases
+_expander_on_change = 'on_change' in inspect.signature(st.expander).parameters
+
+class SessionUser:
+    """Compact per-session record of the logged-in user"""
+    __slots__ = ('user_id', 'name', 'team_number', 'is_tech_lead')
+
+    def __init__(self, user_id, name, team_number, is_tech_lead=False):
+        self.user_id = str(user_id)
+        self.name = str(name)
+        self.team_number = int(team_number)
+        self.is_tech_lead = is_tech_lead
+
+    @classmethod
+    def from_row(cls, row):
+        """Build a session record from a users.csv row, dropping unused columns"""
+        return cls(row['user_id'], row['name'], row['team_number'])
+
+class LeadCredentials:
+    """Keyed hashes of tech lead passwords, held once per server process"""
+    __slots__ = ('hash_key', 'digests')
+
+    def __init__(self, passwords):
+        self.hash_key = secrets.token_bytes(32)
+        self.digests = {
+            int(team_number): self.digest(password)
+            for team_number, password in passwords.items()
+            if password
+        }
+
+    def digest(self, password):
+        return hmac.new(self.hash_key, str(password).encode('utf-8'), hashlib.sha256).digest()
+
+    def verify(self, team_number, password):
+        """Constant-time check of a password against one team's lead credential"""
+        stored = self.digests.get(int(team_number))
+        if stored is None:
+            return False
+        return hmac.compare_digest(stored, self.digest(password))
+
+    def find_team(self, password):
+        """Return the team whose lead password matches, comparing against every team"""
+        candidate = self.digest(password)
+        matched_team = None
+        for team_number, stored in self.digests.items():
+            if hmac.compare_digest(stored, candidate) and matched_team is None:
+                matched_team = team_number
+        return matched_team
+
+def lead_credentials_version():
+    """Digest of the configured lead passwords; changes when one is rotated or revoked"""
+    passwords = st.secrets.get("team_lead_passwords", {})
+    material = json.dumps({str(team): str(password) for team, password in passwords.items()}, sort_keys=True)
+    return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+@st.cache_resource(max_entries=2)
+def load_lead_credentials(version):
+    """Hash the tech lead passwords from Streamlit secrets, once per version of them"""
+    return LeadCredentials(st.secrets.get("team_lead_passwords", {}))
+
+def get_lead_credentials():
+    """Get the cached lead credentials, reporting secrets errors to the user"""
     try:
-        # Access passwords from Streamlit secrets
-        passwords = st.secrets.get("team_lead_passwords", {})
-        return passwords.get(str(team_number))
+        return load_lead_credentials(lead_credentials_version())
     except Exception as e:
         st.error(f"Error accessing credentials: {e}")
         return None
 
 def verify_tech_lead_password(team_number, password):
     """Verify tech lead password against stored credentials"""
-    stored_password = get_team_lead_password(team_number)
-    return stored_password == password
+    credentials = get_lead_credentials()
+    return credentials is not None and credentials.verify(team_number, password)
+
+def find_tech_lead_team(password):
+    """Find the team a tech lead password belongs to, or None"""
+    credentials = get_lead_credentials()
+    return credentials.find_team(password) if credentials is not None else None
+
+@st.cache_resource
+def get_session_signing_key():
+    """Key for signing session tokens; random per process unless session_secret is configured"""
+    try:
+        session_secret = st.secrets.get("session_secret")
+    except Exception:
+        # Developer sessions must not depend on lead secrets being configured
+        session_secret = None
+    return session_secret.encode('utf-8') if session_secret else secrets.token_bytes(32)
+
+def issue_session_token(user_id, lead_team=None):
+    """Issue a signed token recording who is logged in and any lead access"""
+    expires = int(time.time()) + SESSION_TOKEN_TTL
+    payload = f"{lead_team or 0}|{expires}|{user_id}"
+    signature = hmac.new(get_session_signing_key(), payload.encode('utf-8'), hashlib.sha256).hexdigest()
+    return f"{signature}|{payload}"
+
+def verify_session_token(token):
+    """Return (user_id, lead_team) from a valid, unexpired token, else None"""
+    if not token:
+        return None
+    try:
+        signature, payload = token.split('|', 1)
+        lead_team, expires, user_id = payload.split('|', 2)
+        expires, lead_team = int(expires), int(lead_team)
+    except ValueError:
+        return None
+    expected = hmac.new(get_session_signing_key(), payload.encode('utf-8'), hashlib.sha256).hexdigest()
+    if not hmac.compare_digest(signature, expected) or expires < time.time():
+        return None
+    return user_id, lead_team or None
+
+def start_session(user, lead_team=None):
+    """Store the session record and a fresh signed token for it"""
+    st.session_state.user_data = user
+    st.session_state.auth_token = issue_session_token(user.user_id, lead_team)
+    st.session_state.logged_in = True
+    if lead_team:
+        st.session_state.lead_credentials_version = lead_credentials_version()
+
+def lead_credentials_changed():
+    """Whether lead passwords were rotated or revoked since this session's lead login"""
+    try:
+        return st.session_state.get('lead_credentials_version') != lead_credentials_version()
+    except Exception:
+        return True
+
+def get_session_lead_team():
+    """Return the team the current session holds lead access for, or None"""
+    claims = verify_session_token(st.session_state.get('auth_token'))
+    if claims is None or claims[0] != st.session_state.user_data.user_id:
+        return None
+    if claims[1] is not None and lead_credentials_changed():
+        return None
+    return claims[1]
+
+class ChangeEvent:
+    """One insert or update recorded in the doubts change feed"""
+    __slots__ = ('seq', 'action', 'doubt_id', 'user_id', 'team_number', 'row')
+
+    def __init__(self, seq, action, row):
+        self.seq = seq
+        self.action = action
+        self.doubt_id = int(row['doubt_id'])
+        self.user_id = str(row['user_id'])
+        self.team_number = row['team_number']
+        self.row = row
+
+class ChangeFeed:
+    """Monotonically numbered log of recent doubt inserts and updates"""
+
+    def __init__(self, maxlen):
+        self.lock = threading.Lock()
+        self.events = deque(maxlen=maxlen)
+        self.last_seq = 0
+
+    def publish(self, action, row):
+        with self.lock:
+            self.last_seq += 1
+            self.events.append(ChangeEvent(self.last_seq, action, row))
+            return self.last_seq
+
+    def since(self, seq):
+        """Return events after seq, or None if seq fell out of the retained window"""
+        with self.lock:
+            if seq >= self.last_seq:
+                return []
+            first_seq = self.events[0].seq
+            if seq < first_seq - 1:
+                return None
+            return list(islice(self.events, seq - first_seq + 1, None))
+
+@st.cache_resource
+def get_change_feed():
+    """Process-wide doubts change feed shared by all sessions"""
+    return ChangeFeed(CHANGE_FEED_SIZE)
+
+def watch_change_feed(cursor_key, is_relevant):
+    """Poll the change feed in a fragment and rerun the app on relevant events"""
+    if _fragment is None:
+        return
+
+    @_fragment(run_every=FEED_POLL_INTERVAL)
+    def poll_change_feed():
+        events = get_change_feed().since(st.session_state.get(cursor_key, 0))
+        if events is None or any(is_relevant(event) for event in events):
+            st.rerun()
+
+    poll_change_feed()
+
+class DoubtView:
+    """The fields of a doubt that the developer's doubts page renders"""
+    __slots__ = ('doubt_id', 'doubt_text', 'priority', 'status', 'reply_message', 'date', 'timestamp')
+
+    def __init__(self, doubt_id, doubt_text, priority, status, reply_message, date, timestamp):
+        self.doubt_id = int(doubt_id)
+        self.doubt_text = str(doubt_text)
+        self.priority = str(priority)
+        self.status = str(status)
+        # Unreplied doubts read back from CSV carry NaN rather than an empty string
+        self.reply_message = reply_message if isinstance(reply_message, str) else ''
+        self.date = str(date)
+        self.timestamp = str(timestamp)
+
+    @classmethod
+    def from_row(cls, row):
+        return cls(row['doubt_id'], row['doubt_text'], row['priority'], row['status'],
+                   row['reply_message'], row['date'], row['timestamp'])
+
+def sync_unseen_doubts():
+    """Track doubts a lead has not looked at yet, from change feed events, across reruns"""
+    feed = get_change_feed()
+    state = st.session_state
+    if 'lead_unseen_doubts' not in state:
+        # Doubts asked before this session started are not news
+        state.lead_unseen_doubts = {}
+        state.lead_opened_doubts = set()
+        state.lead_doubts_seq = feed.last_seq
+        return
+    
+    events = feed.since(state.lead_doubts_seq)
+    if events is None:
+        # Events fell out of the window; the doubts list still shows every doubt
+        state.lead_doubts_seq = feed.last_seq
+        return
+    
+    for event in events:
+        if event.action == 'created':
+            state.lead_unseen_doubts[event.doubt_id] = int(event.team_number)
+        else:
+            # Replied to or resolved, by this lead or another, so no longer news
+            state.lead_unseen_doubts.pop(event.doubt_id, None)
+        state.lead_doubts_seq = event.seq
+
+def toggle_doubt_expander(doubt_id):
+    """Opening a doubt marks it seen; remember it as open, since dropping its badge renews the expander"""
+    state = st.session_state
+    if state.get(f"doubt_expander_{doubt_id}"):
+        state.lead_unseen_doubts.pop(doubt_id, None)
+        state.lead_opened_doubts.add(doubt_id)
+    else:
+        state.lead_opened_doubts.discard(doubt_id)
+
+def sync_user_doubts(user_id):
+    """Keep the session's copy of a developer's doubts current from the change feed"""
+    feed = get_change_feed()
+    state = st.session_state
+    events = None
+    if state.get('doubts_owner') == user_id:
+        events = feed.since(state.doubts_seq)
+    
+    if events is None:
+        # Full reload; read the cursor first so no change between the two is missed
+        seq = feed.last_seq
+        doubts_df = query_all(DOUBTS_TABLE)
+        user_doubts = doubts_df[doubts_df['user_id'].astype(str) == user_id]
+        state.my_doubts = {
+            int(row['doubt_id']): DoubtView.from_row(row)
+            for row in user_doubts.to_dict('records')
+        }
+        state.doubts_owner = user_id
+        state.doubts_seq = seq
+        return
+    
+    for event in events:
+        if event.user_id == user_id:
+            state.my_doubts[event.doubt_id] = DoubtView.from_row(event.row)
+        state.doubts_seq = event.seq
+
+def sync_unread_replies(user_id):
+    """Collect replies to a developer's doubts from feed events alone, without reading doubts"""
+    feed = get_change_feed()
+    state = st.session_state
+    if state.get('replies_owner') != user_id:
+        # Replies made before this session started are not news
+        state.unread_replies = set()
+        state.replies_owner = user_id
+        state.replies_seq = feed.last_seq
+        return
+    
+    events = feed.since(state.replies_seq)
+    if events is None:
+        # Events fell out of the window; the doubts page still shows every reply
+        state.replies_seq = feed.last_seq
+        return
+    
+    for event in events:
+        if event.user_id == user_id and event.action in ('replied', 'resolved'):
+            state.unread_replies.add(event.doubt_id)
+        state.replies_seq = event.seq
+
+def get_data_version(path):
+    """Cheap version stamp for a CSV file that changes on every write"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+class TeamRegistry:
+    """Versioned snapshot of the team configuration grouped as org -> department -> team"""
+
+    def __init__(self, version, rows):
+        self.version = version
+        self.teams = {}
+        self.hierarchy = {}
+        for row in rows:
+            team_number = int(row['team_number'])
+            org = (row.get('org') or '').strip() or DEFAULT_ORG
+            department = (row.get('department') or '').strip() or DEFAULT_DEPARTMENT
+            self.teams[team_number] = {
+                'lead_name': row['lead_name'],
+                'org': org,
+                'department': department
+            }
+            self.hierarchy.setdefault(org, {}).setdefault(department, []).append(team_number)
+        self.team_numbers = sorted(self.teams)
+
+    def lead_name(self, team_number):
+        team = self.teams.get(team_number)
+        return team['lead_name'] if team else "Unknown Lead"
+
+    def teams_in(self, org=None, department=None):
+        """Team numbers under an org and optionally one of its departments"""
+        if org is None:
+            return self.team_numbers
+        departments = self.hierarchy.get(org, {})
+        if department is None:
+            return sorted(n for teams in departments.values() for n in teams)
+        return sorted(departments.get(department, []))
+
+@st.cache_resource(max_entries=2)
+def load_team_registry(version):
+    """Parse teams.csv into a registry; cached per file version"""
+    with open(TEAMS_CSV, newline='', encoding='utf-8') as f:
+        return TeamRegistry(version, csv.DictReader(f))
+
+def get_team_registry():
+    """Get the current team registry, reloading only when teams.csv changes"""
+    return load_team_registry(get_data_version(TEAMS_CSV))
+
+class TeamIndexedTable:
+    """Read-only DataFrame with row positions indexed by team number"""
+    __slots__ = ('df', 'version', 'team_rows')
+
+    def __init__(self, df, version):
+        self.df = df
+        self.version = version
+        self.team_rows = df.groupby('team_number').indices if not df.empty else {}
+
+    def for_teams(self, team_numbers):
+        """Rows for the given teams, touching only those teams' rows"""
+        positions = sorted(
+            position
+            for team_number in team_numbers
+            for position in self.team_rows.get(team_number, ())
+        )
+        return self.df.iloc[positions]
+
+@st.cache_resource
+def get_indexed_tables():
+    """Latest loaded version of each CSV, shared by all sessions"""
+    return {}, threading.Lock()
+
+def get_indexed_table(path):
+    """Get the team-indexed table for a CSV, reloading only when it changes; never mutate it"""
+    import pandas as pd
+    version = get_data_version(path)
+    tables, guard = get_indexed_tables()
+    table = tables.get(path)
+    if table is None or table.version != version:
+        table = TeamIndexedTable(pd.read_csv(path, dtype={'user_id': str}), version)
+        with guard:
+            tables[path] = table
+    return table
+
+@st.cache_resource(max_entries=2)
+def load_team_shards(version):
+    """Pinned team -> shard assignments for org mode; cached per file version"""
+    if version is None:
+        return {}
+    with open(TEAM_SHARDS_CSV, newline='', encoding='utf-8') as f:
+        return {int(row['team_number']): row['shard'] for row in csv.DictReader(f)}
+
+@st.cache_resource
+def get_team_shards_lock():
+    return threading.Lock()
+
+def pin_team_shard(team_number, shard):
+    """Record a team's shard on its first write; returns the shard the team is pinned to"""
+    with get_team_shards_lock():
+        pinned = load_team_shards(get_data_version(TEAM_SHARDS_CSV)).get(team_number)
+        if pinned:
+            return pinned
+        os.makedirs(SHARDS_DIR, exist_ok=True)
+        write_header = not os.path.exists(TEAM_SHARDS_CSV)
+        with open(TEAM_SHARDS_CSV, 'a', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            if write_header:
+                writer.writerow(['team_number', 'shard'])
+            writer.writerow([team_number, shard])
+        return shard
+
+def shard_for_team(team_number, pin=False):
+    """Name of the shard holding a team's standups and doubts; writers pass pin=True"""
+    if SHARD_BY != "org":
+        return f"team_{int(team_number)}"
+    team_number = int(team_number)
+    pinned = load_team_shards(get_data_version(TEAM_SHARDS_CSV)).get(team_number)
+    if pinned:
+        return pinned
+    team = get_team_registry().teams.get(team_number)
+    org = team['org'] if team else DEFAULT_ORG
+    shard = "org_" + re.sub(r'[^A-Za-z0-9]+', '_', org).strip('_').lower()
+    return pin_team_shard(team_number, shard) if pin else shard
+
+def shard_path(table, shard):
+    return os.path.join(SHARDS_DIR, shard, f"{table}.csv")
+
+def list_shards(table):
+    """All shards that hold rows for a table"""
+    if not os.path.isdir(SHARDS_DIR):
+        return []
+    return sorted(
+        shard for shard in os.listdir(SHARDS_DIR)
+        if os.path.exists(shard_path(table, shard))
+    )
+
+@st.cache_resource
+def get_shard_locks():
+    """Per-shard write locks, so writes only contend within one shard"""
+    return {}, threading.Lock()
+
+def shard_lock(path):
+    locks, guard = get_shard_locks()
+    with guard:
+        return locks.setdefault(path, threading.Lock())
+
+@st.cache_resource
+def get_shard_executor():
+    """Process-wide thread pool for cross-shard reads"""
+    return ThreadPoolExecutor(max_workers=SHARD_QUERY_WORKERS, thread_name_prefix="shard-query")
+
+def max_shard_id(table):
+    """Highest id in any shard of a table, read with the csv module"""
+    id_column = TABLE_ID_COLUMNS[table]
+    max_id = 0
+    for shard in list_shards(table):
+        with open(shard_path(table, shard), newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                try:
+                    max_id = max(max_id, int(row[id_column]))
+                except (TypeError, ValueError):
+                    continue
+    return max_id
+
+class IdAllocator:
+    """Next ids per table, unique across all shards so exports and labels never repeat one"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.next_ids = {}
+
+    def allocate(self, table):
+        # Keyed by the shards directory too, so a process that changes directory starts fresh
+        key = (os.path.abspath(SHARDS_DIR), table)
+        with self.lock:
+            next_id = self.next_ids.get(key)
+            if next_id is None:
+                # Seeded once per process from the files; every later id is a counter bump
+                next_id = max_shard_id(table) + 1
+            self.next_ids[key] = next_id + 1
+            return next_id
+
+@st.cache_resource
+def get_id_allocator():
+    """Process-wide id allocator shared by all sessions"""
+    return IdAllocator()
+
+def replace_csv(path, write):
+    """Write a CSV through a temp file and swap it in, so lock-free readers never see it half written"""
+    temp_path = path + ".tmp"
+    write(temp_path)
+    os.replace(temp_path, path)
+
+def append_shard_row(table, team_number, row):
+    """Route a new row to its team's shard, assigning the table's next id"""
+    path = shard_path(table, shard_for_team(team_number, pin=True))
+    id_column = TABLE_ID_COLUMNS[table]
+    with shard_lock(path):
+        created = not os.path.exists(path)
+        if created:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            def write_header(temp_path):
+                with open(temp_path, 'w', newline='', encoding='utf-8') as f:
+                    csv.writer(f).writerow(TABLE_COLUMNS[table])
+            replace_csv(path, write_header)
+        # Allocated under the shard lock so ids within a shard stay in file order
+        row[id_column] = get_id_allocator().allocate(table)
+        with open(path, 'a', newline='', encoding='utf-8') as f:
+            csv.DictWriter(f, fieldnames=TABLE_COLUMNS[table]).writerow(row)
+    forget_run_version(path, table if created else None)
+    return row
+
+def update_shard_row(table, team_number, row_id, updates):
+    """Apply column updates to one row in a team's shard; returns the updated row or None"""
+    import pandas as pd
+    path = shard_path(table, shard_for_team(team_number))
+    id_column = TABLE_ID_COLUMNS[table]
+    with shard_lock(path):
+        if not os.path.exists(path):
+            return None
+        shard_df = pd.read_csv(path, dtype={'user_id': str})
+        row_index = shard_df[shard_df[id_column] == row_id].index
+        if len(row_index) == 0:
+            return None
+        for column, value in updates.items():
+            # An all-empty column loads as float; widen it before storing text
+            shard_df[column] = shard_df[column].astype(object)
+            shard_df.loc[row_index[0], column] = value
+        replace_csv(path, lambda temp_path: shard_df.to_csv(temp_path, index=False))
+    forget_run_version(path)
+    return shard_df.loc[row_index[0]].to_dict()
+
+def read_shard(table, shard, team_numbers=None):
+    """Rows from one shard, optionally only those of the given teams"""
+    path = shard_path(table, shard)
+    if not os.path.exists(path):
+        return None
+    indexed = get_indexed_table(path)
+    return indexed.df if team_numbers is None else indexed.for_teams(team_numbers)
+
+def merge_shards(table, frames):
+    """Combine per-shard results into one frame in submission order"""
+    import pandas as pd
+    frames = [frame for frame in frames if frame is not None and not frame.empty]
+    if not frames:
+        return pd.DataFrame(columns=TABLE_COLUMNS[table])
+    if len(frames) == 1:
+        return frames[0]
+    merged = pd.concat(frames, ignore_index=True)
+    # Ids are allocated in order across shards; timestamps only resolve to the second
+    return merged.sort_values(TABLE_ID_COLUMNS[table], kind='stable', ignore_index=True)
+
+def query_teams(table, team_numbers):
+    """Rows for the given teams, reading only the shards that hold them"""
+    shard_teams = {}
+    for team_number in team_numbers:
+        shard_teams.setdefault(shard_for_team(team_number), []).append(team_number)
+    if len(shard_teams) <= 1:
+        frames = [read_shard(table, shard, teams) for shard, teams in shard_teams.items()]
+    else:
+        frames = get_shard_executor().map(lambda item: read_shard(table, *item), shard_teams.items())
+    return merge_shards(table, list(frames))
+
+def query_all(table):
+    """All rows of a table, reading every shard in parallel"""
+    frames = get_shard_executor().map(lambda shard: read_shard(table, shard), list_shards(table))
+    return merge_shards(table, list(frames))
+
+def migrate_legacy_csv(legacy_path, table):
+    """Split a pre-sharding CSV into shards by team, keeping its ids"""
+    shard_rows = {}
+    with open(legacy_path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            shard_rows.setdefault(shard_for_team(row['team_number'], pin=True), []).append(row)
+    for shard, rows in shard_rows.items():
+        path = shard_path(table, shard)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        write_header = not os.path.exists(path)
+        with open(path, 'a', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=TABLE_COLUMNS[table], extrasaction='ignore')
+            if write_header:
+                writer.writeheader()
+            writer.writerows(rows)
+    os.replace(legacy_path, legacy_path + ".migrated")
+
+class QueryCache:
+    """LRU cache of query results and CSV payloads, capped by estimated memory"""
+
+    def __init__(self, max_bytes):
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.max_bytes = max_bytes
+        self.used_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def estimate_size(value):
+        if isinstance(value, (str, bytes)):
+            return len(value)
+        if hasattr(value, 'memory_usage'):
+            return int(value.memory_usage(index=True, deep=True).sum())
+        return sys.getsizeof(value)
+
+    def get_or_compute(self, key, compute, count=True):
+        """Cached value for key, computing it on a miss; count=False keeps the lookup out of the stats"""
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                if count:
+                    self.hits += 1
+                return self.entries[key][0]
+            if count:
+                self.misses += 1
+        
+        # Compute outside the lock so slow queries don't block other sessions
+        value = compute()
+        size = self.estimate_size(value)
+        if size > self.max_bytes:
+            return value
+        with self.lock:
+            if key not in self.entries:
+                self.entries[key] = (value, size)
+                self.used_bytes += size
+            while self.used_bytes > self.max_bytes:
+                _, (_, evicted_size) = self.entries.popitem(last=False)
+                self.used_bytes -= evicted_size
+                self.evictions += 1
+        return value
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'entries': len(self.entries),
+                'used_bytes': self.used_bytes,
+                'max_bytes': self.max_bytes
+            }
+
+@st.cache_resource
+def get_query_cache():
+    """Process-wide query result cache shared by all dashboard sessions"""
+    return QueryCache(QUERY_CACHE_MAX_BYTES)
+
+# Shard listings and file versions behind the query keys of this script run. Streamlit
+# executes the script afresh on every rerun, so these start empty each time and a
+# dashboard rerun lists and stats each shard once; this process's writes drop what they change.
+RUN_SHARD_LISTS = {}
+RUN_FILE_VERSIONS = {}
+
+def run_shard_list(table):
+    if table not in RUN_SHARD_LISTS:
+        RUN_SHARD_LISTS[table] = list_shards(table)
+    return RUN_SHARD_LISTS[table]
+
+def run_data_version(path):
+    if path not in RUN_FILE_VERSIONS:
+        RUN_FILE_VERSIONS[path] = get_data_version(path)
+    return RUN_FILE_VERSIONS[path]
+
+def forget_run_version(path, table=None):
+    """Drop a written file's run version, and the table's shard list when a shard was added"""
+    RUN_FILE_VERSIONS.pop(path, None)
+    if table is not None:
+        RUN_SHARD_LISTS.pop(table, None)
+
+def reset_run_versions():
+    """Start a new run's listings, for callers that import the module instead of rerunning it"""
+    RUN_SHARD_LISTS.clear()
+    RUN_FILE_VERSIONS.clear()
+
+def query_data_version(table, teams):
+    """Versions of every file a query reads, so any write to them changes its cache key"""
+    if table == USERS_TABLE:
+        return run_data_version(USERS_CSV)
+    shards = run_shard_list(table) if teams is None else sorted({shard_for_team(team) for team in teams})
+    return tuple((shard, run_data_version(shard_path(table, shard))) for shard in shards)
+
+def query_key(table, team_numbers, filters):
+    """Normalized cache key: table, sorted unique teams, sorted filters and data version"""
+    teams = None if team_numbers is None else tuple(sorted({int(team) for team in team_numbers}))
+    return (table, teams, tuple(sorted(filters.items())), query_data_version(table, teams))
+
+def run_query(table, teams, filters):
+    """Read a table for the given teams (all when None) and apply the filters"""
+    import pandas as pd
+    if table == USERS_TABLE:
+        rows = get_indexed_table(USERS_CSV).df
+    else:
+        rows = query_all(table) if teams is None else query_teams(table, teams)
+    if 'date' in filters:
+        rows = rows[rows['date'] == filters['date']]
+    if 'status' in filters:
+        rows = rows[rows['status'] == filters['status']]
+    if 'date_range' in filters:
+        start, end = filters['date_range']
+        dates = pd.to_datetime(rows['date'])
+        rows = rows[(dates >= pd.to_datetime(start)) & (dates <= pd.to_datetime(end))]
+    return rows
+
+def cached_query(table, team_numbers=None, **filters):
+    """Filtered rows of a table, served from the query cache while its files are unchanged"""
+    key = query_key(table, team_numbers, filters)
+    return get_query_cache().get_or_compute(key, lambda: run_query(table, key[1], filters))
+
+def cached_csv(table, team_numbers=None, **filters):
+    """CSV download payload for a cached query, keyed off the same query key as its rows"""
+    key = query_key(table, team_numbers, filters)
+    cache = get_query_cache()
+    
+    def compute_csv():
+        # The rows are shared with cached_query; this call already counted as one lookup
+        rows = cache.get_or_compute(key, lambda: run_query(table, key[1], filters), count=False)
+        return rows.to_csv(index=False)
+    
+    return cache.get_or_compute(key + ('csv',), compute_csv)
+
+def blocker_terms(text):
+    """Content words of a blocker; empty for blank or "no blockers" answers"""
+    if not isinstance(text, str):
+        return []
+    return [
+        term for term in re.findall(r'[a-z0-9]+', text.lower())
+        if len(term) > 2 and term not in BLOCKER_STOPWORDS
+    ]
+
+def blocker_periods(day):
+    """Day and ISO week keys a standup date falls into, with their start dates"""
+    try:
+        day_date = date.fromisoformat(str(day))
+    except ValueError:
+        return []
+    year, week, weekday = day_date.isocalendar()
+    week_start = date.fromordinal(day_date.toordinal() - weekday + 1)
+    return [(f"day:{day_date.isoformat()}", day_date), (f"week:{year}-W{week:02d}", week_start)]
+
+def retention_cutoff():
+    """Oldest standup date kept in blocker trends"""
+    return date.fromordinal(date.today().toordinal() - BLOCKER_RETENTION_DAYS)
+
+class BlockerCluster:
+    """Group of similar blockers within one day or week"""
+    __slots__ = ('count', 'terms', 'team_days', 'people', 'examples')
+
+    def __init__(self):
+        self.count = 0
+        self.terms = Counter()
+        self.team_days = {}
+        self.people = set()
+        self.examples = []
+
+    def add(self, row, terms):
+        self.count += 1
+        self.terms.update(set(terms))
+        self.team_days.setdefault(int(row['team_number']), set()).add(str(row['date']))
+        self.people.add(str(row['name']))
+        if len(self.examples) < 3:
+            self.examples.append(str(row['blockers']).strip())
+
+    def summary(self):
+        return {
+            'theme': ", ".join(term for term, _ in self.terms.most_common(3)),
+            'mentions': self.count,
+            'teams': sorted(self.team_days),
+            'people': sorted(self.people),
+            'examples': list(self.examples),
+            # Teams that reported this blocker on more than one day of the period
+            'recurring_teams': sorted(team for team, days in self.team_days.items() if len(days) > 1)
+        }
+
+class BlockerPeriod:
+    """Clusters for one day or week; row i of centroids is cluster i's unit-length centroid
+
+    centroids has spare rows and grows by doubling, up to BLOCKER_MAX_CLUSTERS.
+    """
+    __slots__ = ('start', 'centroids', 'clusters')
+
+    def __init__(self, start):
+        self.start = start
+        self.centroids = None
+        self.clusters = []
+
+class BlockerTrendWorker:
+    """Background thread that clusters standup blockers by day and week as rows are saved
+
+    Blockers become hashed TF-IDF vectors (IDF from the documents seen so far)
+    and are assigned online: a blocker joins the most similar centroid above
+    BLOCKER_SIMILARITY, moving it by 1/count as in mini-batch k-means, or
+    starts a new cluster. A period full at BLOCKER_MAX_CLUSTERS folds further
+    blockers into their nearest cluster. Dashboard reruns only read the results.
+    """
+
+    def __init__(self):
+        self.queue = queue.Queue()
+        self.lock = threading.Lock()
+        self.periods = {}
+        # (team, submission_id) of clustered rows with their date, pruned with the periods
+        self.seen = {}
+        self.pruned_cutoff = None
+        self.doc_freq = None
+        self.doc_count = 0
+        self.ready = False
+        self.thread = threading.Thread(target=self.run, name="blocker-trends", daemon=True)
+
+    def submit(self, row):
+        self.queue.put(row)
+
+    def run(self):
+        import numpy as np
+        self.doc_freq = np.zeros(BLOCKER_FEATURES, dtype=np.float32)
+        try:
+            self.process(query_all(STANDUPS_TABLE).to_dict('records'))
+        except Exception:
+            # Trends then start from the rows saved from now on
+            logger.exception("Blocker trend backfill failed")
+        self.ready = True
+        while True:
+            batch = [self.queue.get()]
+            while True:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self.process(batch)
+            except Exception:
+                # One bad batch must not stop the thread, or the queue would never drain again
+                logger.exception("Blocker trend update failed for %d standups", len(batch))
+
+    def process(self, rows):
+        """Vectorize new rows in batches and fold them into their day and week clusters"""
+        import numpy as np
+        cutoff = retention_cutoff()
+        docs = []
+        for row in rows:
+            try:
+                key = (int(row['team_number']), int(row['submission_id']))
+            except (KeyError, TypeError, ValueError):
+                logger.warning("Skipping malformed standup in blocker trends: %r", row)
+                continue
+            periods = blocker_periods(row.get('date'))
+            if not periods or periods[0][1] < cutoff or key in self.seen:
+                continue
+            terms = blocker_terms(row.get('blockers'))
+            if terms:
+                self.seen[key] = periods[0][1]
+                docs.append((row, terms, periods))
+        
+        for start in range(0, len(docs), BLOCKER_BATCH_SIZE):
+            batch = docs[start:start + BLOCKER_BATCH_SIZE]
+            counts = np.zeros((len(batch), BLOCKER_FEATURES), dtype=np.float32)
+            for i, (_, terms, _) in enumerate(batch):
+                for term in terms:
+                    counts[i, zlib.crc32(term.encode('utf-8')) % BLOCKER_FEATURES] += 1
+            present = counts > 0
+            self.doc_freq += present.sum(axis=0)
+            self.doc_count += len(batch)
+            idf = np.log((1 + self.doc_count) / (1 + self.doc_freq)) + 1
+            vectors = np.where(present, 1 + np.log(np.maximum(counts, 1)), 0) * idf
+            vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+            
+            with self.lock:
+                for (row, terms, periods), vector in zip(batch, vectors):
+                    for period_key, period_start in periods:
+                        period = self.periods.get(period_key)
+                        if period is None:
+                            period = self.periods[period_key] = BlockerPeriod(period_start)
+                        self.assign(period, vector, row, terms)
+                self.prune()
+
+    def assign(self, period, vector, row, terms):
+        import numpy as np
+        count = len(period.clusters)
+        if count:
+            # A blocker is a handful of terms, so compare on its nonzero features only
+            features = np.flatnonzero(vector)
+            similarities = period.centroids[:count, features] @ vector[features]
+            best = int(similarities.argmax())
+            if similarities[best] >= BLOCKER_SIMILARITY or count >= BLOCKER_MAX_CLUSTERS:
+                cluster = period.clusters[best]
+                cluster.add(row, terms)
+                centroid = period.centroids[best]
+                centroid += (vector - centroid) / cluster.count
+                centroid /= np.linalg.norm(centroid)
+                return
+        if period.centroids is None or count == len(period.centroids):
+            capacity = min(max(8, 2 * count), BLOCKER_MAX_CLUSTERS)
+            centroids = np.zeros((capacity, BLOCKER_FEATURES), dtype=np.float32)
+            if count:
+                centroids[:count] = period.centroids[:count]
+            period.centroids = centroids
+        period.centroids[count] = vector
+        cluster = BlockerCluster()
+        cluster.add(row, terms)
+        period.clusters.append(cluster)
+
+    def prune(self):
+        # The cutoff only moves once a day, so most batches have nothing to drop
+        cutoff = retention_cutoff()
+        if cutoff == self.pruned_cutoff:
+            return
+        self.pruned_cutoff = cutoff
+        for period_key in [key for key, period in self.periods.items() if period.start < cutoff]:
+            del self.periods[period_key]
+        for key in [key for key, day in self.seen.items() if day < cutoff]:
+            del self.seen[key]
+
+    def summarize(self, period_key):
+        """Cluster summaries for a day or week key, most mentioned first"""
+        with self.lock:
+            period = self.periods.get(period_key)
+            summaries = [cluster.summary() for cluster in period.clusters] if period else []
+        return sorted(summaries, key=lambda summary: -summary['mentions'])
+
+@st.cache_resource
+def get_blocker_worker():
+    """Start the process-wide blocker clustering worker, backfilling from all shards"""
+    worker = BlockerTrendWorker()
+    worker.thread.start()
+    return worker
 
 def init_csv_files():
     """Initialize CSV files if they don't exist"""
     
+    # Teams CSV
+    if not os.path.exists(TEAMS_CSV):
+        with open(TEAMS_CSV, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['team_number', 'lead_name', 'department', 'org'])
+            for team_number, team in DEFAULT_TEAMS_CONFIG.items():
+                writer.writerow([team_number, team['lead_name'], DEFAULT_DEPARTMENT, DEFAULT_ORG])
+    
     # Users CSV
     if not os.path.exists(USERS_CSV):
-        users_df = pd.DataFrame(columns=['user_id', 'name', 'team_number', 'registration_date'])
-        users_df.to_csv(USERS_CSV, index=False)
-    
-    # Standups CSV
-    if not os.path.exists(STANDUPS_CSV):
-        standups_df = pd.DataFrame(columns=[
-            'submission_id', 'user_id', 'name', 'team_number', 
-            'date', 'yesterday_work', 'today_plan', 'blockers', 'timestamp'
-        ])
-        standups_df.to_csv(STANDUPS_CSV, index=False)
-    
-    # Doubts CSV
-    if not os.path.exists(DOUBTS_CSV):
-        doubts_df = pd.DataFrame(columns=[
-            'doubt_id', 'user_id', 'name', 'team_number', 
-            'doubt_text', 'priority', 'status', 'reply_message', 'date', 'timestamp'
-        ])
-        doubts_df.to_csv(DOUBTS_CSV, index=False)
+        with open(USERS_CSV, 'w', newline='', encoding='utf-8') as f:
+            csv.writer(f).writerow(USER_COLUMNS)
+    
+    # Standups and doubts shards are created on first write; move any unsharded data into them
+    os.makedirs(SHARDS_DIR, exist_ok=True)
+    for legacy_path, table in ((STANDUPS_CSV, STANDUPS_TABLE), (DOUBTS_CSV, DOUBTS_TABLE)):
+        if os.path.exists(legacy_path):
+            migrate_legacy_csv(legacy_path, table)
+
+@st.cache_resource
+def init_storage():
+    """Create missing CSV files once per server process rather than on every rerun"""
+    init_csv_files()
+    return True
+
+@st.cache_resource
+def start_cache_warmer():
+    """Import pandas and load the storage caches in a background thread, once per process"""
+    def warm_caches():
+        import pandas
+        get_team_registry()
+        get_indexed_table(USERS_CSV)
+        for table in (STANDUPS_TABLE, DOUBTS_TABLE):
+            query_all(table)
+        get_blocker_worker()
+
+    warmer = threading.Thread(target=warm_caches, name="cache-warmer", daemon=True)
+    warmer.start()
+    return warmer
 
 def load_users():
     """Load users from CSV"""
+    import pandas as pd
     try:
-        return pd.read_csv(USERS_CSV)
+        # IDs are typed at login; reading them as numbers turns "007" into 7
+        return pd.read_csv(USERS_CSV, dtype={'user_id': str})
     except:
-        return pd.DataFrame(columns=['user_id', 'name', 'team_number', 'registration_date'])
+        return pd.DataFrame(columns=USER_COLUMNS)
+
+@st.cache_resource
+def get_users_lock():
+    """Serializes writes to users.csv, which is not sharded"""
+    return threading.Lock()
 
 def save_user(user_id, name, team_number):
-    """Save new user to CSV"""
-    users_df = load_users()
-    
-    new_user = pd.DataFrame({
-        'user_id': [user_id],
-        'name': [name],
-        'team_number': [team_number],
-        'registration_date': [datetime.now().strftime('%Y-%m-%d %H:%M:%S')]
-    })
-    
-    users_df = pd.concat([users_df, new_user], ignore_index=True)
-    users_df.to_csv(USERS_CSV, index=False)
+    """Append new user to CSV"""
+    with get_users_lock():
+        with open(USERS_CSV, 'a', newline='', encoding='utf-8') as f:
+            csv.writer(f).writerow([user_id, name, team_number, datetime.now().strftime('%Y-%m-%d %H:%M:%S')])
+    forget_run_version(USERS_CSV)
+
+def change_user_team(user_id, new_team):
+    """Move a developer to another team"""
+    with get_users_lock():
+        users_df = load_users()
+        users_df.loc[users_df['user_id'] == str(user_id), 'team_number'] = new_team
+        replace_csv(USERS_CSV, lambda temp_path: users_df.to_csv(temp_path, index=False))
+    forget_run_version(USERS_CSV)
+
+@st.cache_resource(max_entries=2)
+def load_user_index(version):
+    """Map each user_id to its first users.csv row; cached per file version"""
+    users = {}
+    with open(USERS_CSV, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            users.setdefault(row['user_id'], row)
+    return users
 
 def get_user_by_id(user_id):
     """Get user details by user_id"""
-    users_df = load_users()
-    user_data = users_df[users_df['user_id'] == user_id]
-    return user_data.iloc[0] if not user_data.empty else None
+    return load_user_index(get_data_version(USERS_CSV)).get(str(user_id))
 
 def save_standup(user_data, yesterday_work, today_plan, blockers):
-    """Save standup submission to CSV"""
-    standups_df = pd.read_csv(STANDUPS_CSV)
-    
-    submission_id = len(standups_df) + 1
-    
-    new_standup = pd.DataFrame({
-        'submission_id': [submission_id],
-        'user_id': [user_data['user_id']],
-        'name': [user_data['name']],
-        'team_number': [user_data['team_number']],
-        'date': [date.today().strftime('%Y-%m-%d')],
-        'yesterday_work': [yesterday_work],
-        'today_plan': [today_plan],
-        'blockers': [blockers],
-        'timestamp': [datetime.now().strftime('%Y-%m-%d %H:%M:%S')]
+    """Save standup submission to its team's shard and queue it for blocker clustering"""
+    standup = append_shard_row(STANDUPS_TABLE, user_data.team_number, {
+        'user_id': user_data.user_id,
+        'name': user_data.name,
+        'team_number': user_data.team_number,
+        'date': date.today().strftime('%Y-%m-%d'),
+        'yesterday_work': yesterday_work,
+        'today_plan': today_plan,
+        'blockers': blockers,
+        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     })
-    
-    standups_df = pd.concat([standups_df, new_standup], ignore_index=True)
-    standups_df.to_csv(STANDUPS_CSV, index=False)
+    get_blocker_worker().submit(standup)
 
 def save_doubt(user_data, doubt_text, priority):
-    """Save doubt submission to CSV"""
-    doubts_df = pd.read_csv(DOUBTS_CSV)
-    
-    doubt_id = len(doubts_df) + 1
-    
-    new_doubt = pd.DataFrame({
-        'doubt_id': [doubt_id],
-        'user_id': [user_data['user_id']],
-        'name': [user_data['name']],
-        'team_number': [user_data['team_number']],
-        'doubt_text': [doubt_text],
-        'priority': [priority],
-        'status': ['Open'],
-        'reply_message': [""],
-        'date': [date.today().strftime('%Y-%m-%d')],
-        'timestamp': [datetime.now().strftime('%Y-%m-%d %H:%M:%S')]
+    """Save doubt submission to its team's shard and return the stored row"""
+    doubt = append_shard_row(DOUBTS_TABLE, user_data.team_number, {
+        'user_id': user_data.user_id,
+        'name': user_data.name,
+        'team_number': user_data.team_number,
+        'doubt_text': doubt_text,
+        'priority': priority,
+        'status': 'Open',
+        'reply_message': "",
+        'date': date.today().strftime('%Y-%m-%d'),
+        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     })
-    
-    doubts_df = pd.concat([doubts_df, new_doubt], ignore_index=True)
-    doubts_df.to_csv(DOUBTS_CSV, index=False)
+    get_change_feed().publish('created', doubt)
+    return doubt
 
-def update_doubt_reply(doubt_id, reply_message, lead_name):
+def update_doubt_reply(doubt_id, team_number, reply_message, lead_name):
     """Update doubt with tech lead's reply"""
-    doubts_df = pd.read_csv(DOUBTS_CSV)
-    
-    # Find the doubt and update it
-    doubt_index = doubts_df[doubts_df['doubt_id'] == doubt_id].index
-    if len(doubt_index) > 0:
-        doubts_df.loc[doubt_index[0], 'reply_message'] = f"[{lead_name}]: {reply_message}"
-        doubts_df.loc[doubt_index[0], 'status'] = 'Replied'
-        doubts_df.to_csv(DOUBTS_CSV, index=False)
+    doubt = update_shard_row(DOUBTS_TABLE, team_number, doubt_id, {
+        'reply_message': f"[{lead_name}]: {reply_message}",
+        'status': 'Replied'
+    })
+    if doubt is not None:
+        get_change_feed().publish('replied', doubt)
+        return True
+    return False
+
+def resolve_doubt(doubt_id, team_number):
+    """Mark a doubt as resolved"""
+    doubt = update_shard_row(DOUBTS_TABLE, team_number, doubt_id, {'status': 'Resolved'})
+    if doubt is not None:
+        get_change_feed().publish('resolved', doubt)
         return True
     return False
 
@@ -150,6 +1162,8 @@ def user_registration_page():
     st.title("🚀 Welcome to Standup Reports")
     st.markdown("---")
     
+    registry = get_team_registry()
+    
     tab1, tab2, tab3 = st.tabs(["🔐 Developer Login", "👤 New Developer Registration", "👥 Tech Lead Login"])
     
     with tab1:
@@ -163,8 +1177,7 @@ def user_registration_page():
                 if user_id:
                     user_data = get_user_by_id(user_id)
                     if user_data is not None:
-                        st.session_state.user_data = user_data.to_dict()
-                        st.session_state.logged_in = True
+                        start_session(SessionUser.from_row(user_data))
                         st.success(f"Welcome back {user_data['name']}!")
                         st.rerun()
                     else:
@@ -180,7 +1193,7 @@ def user_registration_page():
             user_id = st.text_input("Developer ID*", placeholder="Enter your developer ID")
             team_number = st.selectbox(
                 "Select Your Team*", 
-                options=list(TEAMS_CONFIG.keys()),
+                options=registry.team_numbers,
                 format_func=lambda x: f"Team {x}"
             )
             
@@ -194,12 +1207,7 @@ def user_registration_page():
                         st.error(f"Developer ID '{user_id}' already exists! Please use the login tab.")
                     else:
                         save_user(user_id, name, team_number)
-                        st.session_state.user_data = {
-                            'user_id': user_id,
-                            'name': name,
-                            'team_number': team_number
-                        }
-                        st.session_state.logged_in = True
+                        start_session(SessionUser(user_id, name, team_number))
                         st.success(f"Welcome {name}! You're registered to Team {team_number}")
                         st.rerun()
                 else:
@@ -212,8 +1220,8 @@ def user_registration_page():
         with st.form("lead_direct_login"):
             team_selection = st.selectbox(
                 "Select Your Team", 
-                options=list(TEAMS_CONFIG.keys()),
-                format_func=lambda x: f"Team {x} - {TEAMS_CONFIG[x]['lead_name']}"
+                options=registry.team_numbers,
+                format_func=lambda x: f"Team {x} - {registry.lead_name(x)}"
             )
             
             lead_password = st.text_input("Tech Lead Password", type="password", 
@@ -225,15 +1233,14 @@ def user_registration_page():
                 if lead_password:
                     # Verify tech lead password
                     if verify_tech_lead_password(team_selection, lead_password):
-                        st.session_state.user_data = {
-                            'user_id': f"LEAD_{team_selection}",
-                            'name': TEAMS_CONFIG[team_selection]['lead_name'],
-                            'team_number': team_selection,
-                            'is_tech_lead': True
-                        }
-                        st.session_state.logged_in = True
-                        st.session_state.lead_authenticated = True
-                        st.success(f"Welcome Tech Lead {TEAMS_CONFIG[team_selection]['lead_name']}!")
+                        lead_user = SessionUser(
+                            f"LEAD_{team_selection}",
+                            registry.lead_name(team_selection),
+                            team_selection,
+                            is_tech_lead=True
+                        )
+                        start_session(lead_user, lead_team=team_selection)
+                        st.success(f"Welcome Tech Lead {registry.lead_name(team_selection)}!")
                         st.rerun()
                     else:
                         st.error("❌ Invalid tech lead password!")
@@ -245,14 +1252,14 @@ def submit_standup_page():
     user_data = st.session_state.user_data
     
     st.title("📝 Daily Standup Submission")
-    st.markdown(f"**Developer:** {user_data['name']} | **Team:** {user_data['team_number']}")
+    st.markdown(f"**Developer:** {user_data.name} | **Team:** {user_data.team_number}")
     st.markdown("---")
     
-    # Check if user already submitted today
-    standups_df = pd.read_csv(STANDUPS_CSV)
+    # Check if user already submitted today, reading only their team's shard
+    standups_df = query_teams(STANDUPS_TABLE, [user_data.team_number])
     today_str = date.today().strftime('%Y-%m-%d')
     today_submission = standups_df[
-        (standups_df['user_id'] == user_data['user_id']) & 
+        (standups_df['user_id'].astype(str) == user_data.user_id) & 
         (standups_df['date'] == today_str)
     ]
     
@@ -309,30 +1316,37 @@ def submit_doubt_page():
     user_data = st.session_state.user_data
     
     st.title("❓ Submit Your Doubts")
-    st.markdown(f"**Developer:** {user_data['name']} | **Team:** {user_data['team_number']}")
+    st.markdown(f"**Developer:** {user_data.name} | **Team:** {user_data.team_number}")
     st.markdown("---")
     
-    # Show user's existing doubts and replies
-    doubts_df = pd.read_csv(DOUBTS_CSV)
-    user_doubts = doubts_df[doubts_df['user_id'] == user_data['user_id']]
+    # Show user's existing doubts and replies, kept current by the change feed
+    sync_user_doubts(user_data.user_id)
+    user_doubts = st.session_state.my_doubts
+    unread_replies = st.session_state.unread_replies
     
-    if not user_doubts.empty:
+    if user_doubts:
         st.subheader("📋 Your Previous Doubts")
         
-        for _, doubt in user_doubts.iterrows():
-            with st.expander(f"Doubt #{doubt['doubt_id']} - {doubt['priority']} Priority - {doubt['status']} (Submitted: {doubt['date']})"):
-                st.write(f"**Your Question:** {doubt['doubt_text']}")
-                st.write(f"**Status:** {doubt['status']}")
-                st.write(f"**Submitted:** {doubt['timestamp']}")
+        # Ids are allocated in submission order across all shards
+        for doubt_id in sorted(user_doubts):
+            doubt = user_doubts[doubt_id]
+            badge = "🆕 " if doubt_id in unread_replies else ""
+            with st.expander(f"{badge}Doubt #{doubt.doubt_id} - {doubt.priority} Priority - {doubt.status} (Submitted: {doubt.date})"):
+                st.write(f"**Your Question:** {doubt.doubt_text}")
+                st.write(f"**Status:** {doubt.status}")
+                st.write(f"**Submitted:** {doubt.timestamp}")
                 
                 # Show tech lead's reply if any
-                if pd.notna(doubt['reply_message']) and doubt['reply_message'].strip():
-                    st.write(f"**Tech Lead's Reply:** {doubt['reply_message']}")
-                elif doubt['status'] == 'Open':
+                if doubt.reply_message.strip():
+                    st.write(f"**Tech Lead's Reply:** {doubt.reply_message}")
+                elif doubt.status == 'Open':
                     st.info("⏳ Waiting for tech lead's response...")
         
         st.markdown("---")
     
+    # Replies shown on this page count as read; the sidebar badge is drawn after this
+    unread_replies.clear()
+    
     with st.form("doubt_form"):
         st.subheader("Ask Your Question")
         
@@ -362,22 +1376,23 @@ def change_team_page():
     """Allow developer to change their team assignment"""
     user_data = st.session_state.user_data
     st.subheader("🔄 Change Your Team")
-    st.info(f"Your current team: Team {user_data['team_number']}")
+    st.info(f"Your current team: Team {user_data.team_number}")
+    
+    registry = get_team_registry()
+    team_numbers = registry.team_numbers
     
     with st.form("change_team_form"):
         new_team = st.selectbox(
             "Select New Team",
-            options=list(TEAMS_CONFIG.keys()),
-            index=list(TEAMS_CONFIG.keys()).index(user_data['team_number']),
-            format_func=lambda x: f"Team {x} - {TEAMS_CONFIG[x]['lead_name']}"
+            options=team_numbers,
+            index=team_numbers.index(user_data.team_number) if user_data.team_number in registry.teams else 0,
+            format_func=lambda x: f"Team {x} - {registry.lead_name(x)}"
         )
         submitted = st.form_submit_button("Update Team", use_container_width=True)
         if submitted:
-            if new_team != user_data['team_number']:
-                users_df = load_users()
-                users_df.loc[users_df['user_id'] == user_data['user_id'], 'team_number'] = new_team
-                users_df.to_csv(USERS_CSV, index=False)
-                st.session_state.user_data['team_number'] = new_team
+            if new_team != user_data.team_number:
+                change_user_team(user_data.user_id, new_team)
+                user_data.team_number = new_team
                 st.success(f"Team updated to Team {new_team}!")
                 st.rerun()
             else:
@@ -385,18 +1400,12 @@ def change_team_page():
 
 def team_lead_dashboard():
     """Tech lead dashboard with password protection"""
+    import pandas as pd
     st.title("👥 Tech Lead Dashboard")
     st.markdown("---")
     
-    # Check if user is already authenticated as tech lead from direct login
-    if st.session_state.user_data.get('is_tech_lead', False):
-        st.session_state.lead_authenticated = True
-    
-    # Password authentication for regular users accessing tech lead dashboard
-    if 'lead_authenticated' not in st.session_state:
-        st.session_state.lead_authenticated = False
-    
-    if not st.session_state.lead_authenticated:
+    # Lead access (direct login or earlier authentication) is carried by the signed session token
+    if get_session_lead_team() is None:
         st.subheader("🔐 Tech Lead Authentication")
         st.info("💡 Regular developers need to authenticate with tech lead password to access this dashboard")
         st.warning("⚠️ Only tech leads should access this dashboard. Please contact your tech lead for credentials.")
@@ -407,15 +1416,10 @@ def team_lead_dashboard():
             
             if auth_submitted:
                 # Check if password matches any tech lead password
-                valid_password = False
-                for team_id in TEAMS_CONFIG.keys():
-                    if verify_tech_lead_password(team_id, password):
-                        st.session_state.lead_authenticated = True
-                        st.session_state.lead_team_access = team_id
-                        valid_password = True
-                        break
+                lead_team = find_tech_lead_team(password)
                 
-                if valid_password:
+                if lead_team is not None:
+                    start_session(st.session_state.user_data, lead_team=lead_team)
                     st.success("✅ Authentication successful!")
                     st.rerun()
                 else:
@@ -425,39 +1429,39 @@ def team_lead_dashboard():
     # Authenticated tech lead dashboard
     st.success("🎉 Welcome Tech Lead!")
     
-    tab1, tab2, tab3, tab4 = st.tabs(["📝 Standups", "❓ Doubts", "📥 Downloads", "📊 All Teams Overview"])
+    registry = get_team_registry()
+    
+    tab1, tab2, tab3, tab4, tab5 = st.tabs(["📝 Standups", "❓ Doubts", "📥 Downloads", "📊 All Teams Overview", "🚧 Blocker Trends"])
     
     with tab1:
         st.subheader("Standups Management")
         
         # Get the tech lead's team number
-        lead_team = st.session_state.user_data.get('team_number', 1)
+        lead_team = st.session_state.user_data.team_number
         
         # Team filter - default to lead's team, but allow selection of other teams
         selected_teams = st.multiselect(
             "Filter by Teams",
-            options=list(TEAMS_CONFIG.keys()),
-            default=[lead_team],  # Default to lead's team
+            options=registry.team_numbers,
+            default=[lead_team] if lead_team in registry.teams else [],  # Default to lead's team
             format_func=lambda x: f"Team {x}"
         )
         
         # Date filter
         date_filter = st.date_input("Filter by Date", value=date.today())
         
-        # Load and filter standups
-        standups_df = pd.read_csv(STANDUPS_CSV)
+        # Load and filter standups from the selected teams' shards, via the query cache
+        team_standups = cached_query(STANDUPS_TABLE, selected_teams)
         
-        if not standups_df.empty:
-            filtered_standups = standups_df[
-                (standups_df['team_number'].isin(selected_teams)) &
-                (standups_df['date'] == date_filter.strftime('%Y-%m-%d'))
-            ]
+        if not team_standups.empty:
+            standup_filters = {'date': date_filter.strftime('%Y-%m-%d')}
+            filtered_standups = cached_query(STANDUPS_TABLE, selected_teams, **standup_filters)
             
             if not filtered_standups.empty:
                 st.write(f"**Showing {len(filtered_standups)} standups**")
                 
                 # Download button
-                csv_data = filtered_standups.to_csv(index=False)
+                csv_data = cached_csv(STANDUPS_TABLE, selected_teams, **standup_filters)
                 st.download_button(
                     label="📥 Download Standups CSV",
                     data=csv_data,
@@ -475,43 +1479,52 @@ def team_lead_dashboard():
             else:
                 st.info("No standups found for selected filters.")
         else:
-            st.info("No standups submitted yet.")
+            st.info("No standups submitted yet for the selected teams.")
     
     with tab2:
         st.subheader("Doubts Management")
         
         # Get the tech lead's team number
-        lead_team = st.session_state.user_data.get('team_number', 1)
-        lead_name = st.session_state.user_data.get('name', 'Tech Lead')
+        lead_team = st.session_state.user_data.team_number
+        lead_name = st.session_state.user_data.name
         
-        # Load doubts
-        doubts_df = pd.read_csv(DOUBTS_CSV)
+        # New doubts stay badged until the lead opens, replies to or resolves them
+        sync_unseen_doubts()
+        unseen_doubts = st.session_state.lead_unseen_doubts
+        watch_change_feed(
+            'lead_doubts_seq',
+            lambda event: event.team_number in st.session_state.get('doubts_team_filter', [lead_team])
+        )
         
-        if not doubts_df.empty:
-            # Status filter
-            status_filter = st.selectbox("Filter by Status", ["All", "Open", "Replied", "Resolved"])
-            
-            # Team filter for doubts - default to lead's team, but allow selection of other teams
-            selected_teams_doubts = st.multiselect(
-                "Filter by Teams",
-                options=list(TEAMS_CONFIG.keys()),
-                default=[lead_team],  # Default to lead's team
-                format_func=lambda x: f"Team {x}",
-                key="doubts_team_filter"
-            )
-            
-            filtered_doubts = doubts_df.copy()
-            if status_filter != "All":
-                filtered_doubts = filtered_doubts[filtered_doubts['status'] == status_filter]
+        # Status filter
+        status_filter = st.selectbox("Filter by Status", ["All", "Open", "Replied", "Resolved"])
+        
+        # Team filter for doubts - default to lead's team, but allow selection of other teams
+        selected_teams_doubts = st.multiselect(
+            "Filter by Teams",
+            options=registry.team_numbers,
+            default=[lead_team] if lead_team in registry.teams else [],  # Default to lead's team
+            format_func=lambda x: f"Team {x}",
+            key="doubts_team_filter"
+        )
+        
+        # Load only the selected teams' shards, via the query cache
+        team_doubts = cached_query(DOUBTS_TABLE, selected_teams_doubts)
+        
+        if not team_doubts.empty:
+            doubt_filters = {} if status_filter == "All" else {'status': status_filter}
+            filtered_doubts = cached_query(DOUBTS_TABLE, selected_teams_doubts, **doubt_filters)
             
-            # Apply team filter
-            filtered_doubts = filtered_doubts[filtered_doubts['team_number'].isin(selected_teams_doubts)]
+            # Badge questions that arrived since this lead last looked
+            new_doubt_count = sum(1 for team in unseen_doubts.values() if team in selected_teams_doubts)
+            if new_doubt_count:
+                st.info(f"🔔 {new_doubt_count} new doubt(s) since your last visit")
             
             if not filtered_doubts.empty:
                 st.write(f"**Showing {len(filtered_doubts)} doubts**")
                 
                 # Download button
-                csv_data = filtered_doubts.to_csv(index=False)
+                csv_data = cached_csv(DOUBTS_TABLE, selected_teams_doubts, **doubt_filters)
                 st.download_button(
                     label="📥 Download Doubts CSV",
                     data=csv_data,
@@ -521,7 +1534,16 @@ def team_lead_dashboard():
                 
                 # Display doubts
                 for _, doubt in filtered_doubts.iterrows():
-                    with st.expander(f"{doubt['name']} - Team {doubt['team_number']} [{doubt['priority']} Priority] (Submitted: {doubt['timestamp']})"):
+                    doubt_id = int(doubt['doubt_id'])
+                    badge = "🆕 " if doubt_id in unseen_doubts else ""
+                    label = f"{badge}{doubt['name']} - Team {doubt['team_number']} [{doubt['priority']} Priority] (Submitted: {doubt['timestamp']})"
+                    if _expander_on_change:
+                        expander = st.expander(label, expanded=doubt_id in st.session_state.lead_opened_doubts,
+                                               key=f"doubt_expander_{doubt_id}",
+                                               on_change=toggle_doubt_expander, args=(doubt_id,))
+                    else:
+                        expander = st.expander(label)
+                    with expander:
                         st.write(f"**Question:** {doubt['doubt_text']}")
                         st.write(f"**Status:** {doubt['status']}")
                         st.write(f"**Date:** {doubt['date']}")
@@ -537,21 +1559,21 @@ def team_lead_dashboard():
                             st.write("**Add/Update Reply:**")
                             
                             # Create a unique key for each doubt's reply form
-                            reply_key = f"reply_form_{doubt['doubt_id']}"
+                            reply_key = f"reply_form_{doubt_id}"
                             
                             with st.form(key=reply_key):
                                 reply_text = st.text_area(
                                     "Your reply message",
                                     placeholder="Enter your reply to this doubt...",
                                     height=100,
-                                    key=f"reply_text_{doubt['doubt_id']}"
+                                    key=f"reply_text_{doubt_id}"
                                 )
                                 
                                 col1, col2 = st.columns(2)
                                 with col1:
                                     if st.form_submit_button("Send Reply", use_container_width=True):
                                         if reply_text.strip():
-                                            if update_doubt_reply(doubt['doubt_id'], reply_text, lead_name):
+                                            if update_doubt_reply(doubt['doubt_id'], doubt['team_number'], reply_text, lead_name):
                                                 st.success("Reply sent successfully!")
                                                 st.rerun()
                                             else:
@@ -562,30 +1584,31 @@ def team_lead_dashboard():
                                 with col2:
                                     if st.form_submit_button("Mark as Resolved", use_container_width=True):
                                         # Update doubt status to resolved
-                                        doubts_df.loc[doubts_df['doubt_id'] == doubt['doubt_id'], 'status'] = 'Resolved'
-                                        doubts_df.to_csv(DOUBTS_CSV, index=False)
-                                        st.success("Doubt marked as resolved!")
-                                        st.rerun()
+                                        if resolve_doubt(doubt['doubt_id'], doubt['team_number']):
+                                            st.success("Doubt marked as resolved!")
+                                            st.rerun()
+                                        else:
+                                            st.error("Failed to resolve doubt. Please try again.")
             else:
                 st.info("No doubts found for selected filter.")
         else:
-            st.info("No doubts submitted yet.")
+            st.info("No doubts submitted yet for the selected teams.")
     
     with tab3:
         st.subheader("📥 Bulk Downloads")
         st.info("Download complete datasets for analysis")
         
         # Load all data
-        standups_df = pd.read_csv(STANDUPS_CSV)
-        doubts_df = pd.read_csv(DOUBTS_CSV)
-        users_df = pd.read_csv(USERS_CSV)
+        standups_df = cached_query(STANDUPS_TABLE)
+        doubts_df = cached_query(DOUBTS_TABLE)
+        users_df = cached_query(USERS_TABLE)
         
         col1, col2, col3 = st.columns(3)
         
         with col1:
             st.write("**All Standups**")
             if not standups_df.empty:
-                csv_data = standups_df.to_csv(index=False)
+                csv_data = cached_csv(STANDUPS_TABLE)
                 st.download_button(
                     label="📥 Download All Standups",
                     data=csv_data,
@@ -600,7 +1623,7 @@ def team_lead_dashboard():
         with col2:
             st.write("**All Doubts**")
             if not doubts_df.empty:
-                csv_data = doubts_df.to_csv(index=False)
+                csv_data = cached_csv(DOUBTS_TABLE)
                 st.download_button(
                     label="📥 Download All Doubts",
                     data=csv_data,
@@ -615,7 +1638,7 @@ def team_lead_dashboard():
         with col3:
             st.write("**All Developers**")
             if not users_df.empty:
-                csv_data = users_df.to_csv(index=False)
+                csv_data = cached_csv(USERS_TABLE)
                 st.download_button(
                     label="📥 Download All Developers",
                     data=csv_data,
@@ -634,7 +1657,7 @@ def team_lead_dashboard():
         # Team selection for downloads
         download_team_filter = st.selectbox(
             "Select Team for Download",
-            options=['All Teams'] + [f"Team {i}" for i in TEAMS_CONFIG.keys()],
+            options=['All Teams'] + [f"Team {i}" for i in registry.team_numbers],
             key="team_download_filter"
         )
         
@@ -646,9 +1669,9 @@ def team_lead_dashboard():
             with col1:
                 st.write(f"**{download_team_filter} Standups**")
                 if not standups_df.empty:
-                    team_standups = standups_df[standups_df['team_number'] == selected_team_num]
+                    team_standups = cached_query(STANDUPS_TABLE, [selected_team_num])
                     if not team_standups.empty:
-                        csv_data = team_standups.to_csv(index=False)
+                        csv_data = cached_csv(STANDUPS_TABLE, [selected_team_num])
                         st.download_button(
                             label=f"📥 Download {download_team_filter} Standups",
                             data=csv_data,
@@ -665,9 +1688,9 @@ def team_lead_dashboard():
             with col2:
                 st.write(f"**{download_team_filter} Doubts**")
                 if not doubts_df.empty:
-                    team_doubts = doubts_df[doubts_df['team_number'] == selected_team_num]
+                    team_doubts = cached_query(DOUBTS_TABLE, [selected_team_num])
                     if not team_doubts.empty:
-                        csv_data = team_doubts.to_csv(index=False)
+                        csv_data = cached_csv(DOUBTS_TABLE, [selected_team_num])
                         st.download_button(
                             label=f"📥 Download {download_team_filter} Doubts",
                             data=csv_data,
@@ -693,24 +1716,23 @@ def team_lead_dashboard():
         with col3:
             date_team_filter = st.selectbox(
                 "Select Team",
-                options=['All Teams'] + [f"Team {i}" for i in TEAMS_CONFIG.keys()],
+                options=['All Teams'] + [f"Team {i}" for i in registry.team_numbers],
                 key="date_team_filter"
             )
         
         if start_date <= end_date:
             # Filter standups by date range and optionally by team
             if not standups_df.empty:
-                standups_df_copy = standups_df.copy()
-                standups_df_copy['date'] = pd.to_datetime(standups_df_copy['date'])
-                filtered_standups = standups_df_copy[
-                    (standups_df_copy['date'] >= pd.to_datetime(start_date)) &
-                    (standups_df_copy['date'] <= pd.to_datetime(end_date))
-                ]
-                
-                # Apply team filter if specific team is selected
+                # Narrow to the selected team's shard, then the date range
+                range_filters = {'date_range': (start_date.isoformat(), end_date.isoformat())}
                 if date_team_filter != 'All Teams':
                     selected_team_num = int(date_team_filter.split()[1])
-                    filtered_standups = filtered_standups[filtered_standups['team_number'] == selected_team_num]
+                    range_teams = [selected_team_num]
+                else:
+                    range_teams = None
+                filtered_standups = cached_query(STANDUPS_TABLE, range_teams, **range_filters)
+                
+                if date_team_filter != 'All Teams':
                     file_prefix = f"team_{selected_team_num}_standups"
                     button_label = f"📥 Download {date_team_filter} Standups ({start_date} to {end_date})"
                 else:
@@ -718,7 +1740,7 @@ def team_lead_dashboard():
                     button_label = f"📥 Download All Standups ({start_date} to {end_date})"
                 
                 if not filtered_standups.empty:
-                    csv_data = filtered_standups.to_csv(index=False)
+                    csv_data = cached_csv(STANDUPS_TABLE, range_teams, **range_filters)
                     st.download_button(
                         label=button_label,
                         data=csv_data,
@@ -736,15 +1758,15 @@ def team_lead_dashboard():
         st.subheader("📊 All Teams Overview")
         
         # Load all data
-        standups_df = pd.read_csv(STANDUPS_CSV)
-        doubts_df = pd.read_csv(DOUBTS_CSV)
-        users_df = pd.read_csv(USERS_CSV)
+        standups_df = cached_query(STANDUPS_TABLE)
+        doubts_df = cached_query(DOUBTS_TABLE)
+        users_df = cached_query(USERS_TABLE)
         
         # Team statistics
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            st.metric("Total Teams", len(TEAMS_CONFIG))
+            st.metric("Total Teams", len(registry.teams))
         
         with col2:
             st.metric("Total Developers", len(users_df))
@@ -757,27 +1779,107 @@ def team_lead_dashboard():
             open_doubts = doubts_df[doubts_df['status'] == 'Open']
             st.metric("Open Doubts", len(open_doubts))
         
-        # Team-wise breakdown
+        # Team-wise breakdown, scoped through the org -> department hierarchy
         st.subheader("Team-wise Statistics")
-        team_stats = []
         
-        for team_id in TEAMS_CONFIG.keys():
-            team_users = users_df[users_df['team_number'] == team_id]
-            team_standups_today = today_standups[today_standups['team_number'] == team_id]
-            team_open_doubts = open_doubts[open_doubts['team_number'] == team_id]
+        col1, col2 = st.columns(2)
+        with col1:
+            org_filter = st.selectbox(
+                "Organization",
+                options=['All Organizations'] + sorted(registry.hierarchy),
+                key="overview_org_filter"
+            )
+        org = None if org_filter == 'All Organizations' else org_filter
+        with col2:
+            department_filter = st.selectbox(
+                "Department",
+                options=['All Departments'] + sorted(registry.hierarchy.get(org, {})),
+                key="overview_department_filter"
+            )
+        department = None if department_filter == 'All Departments' else department_filter
+        scope_teams = registry.teams_in(org, department)
+        
+        # One counting pass per table instead of a scan per team
+        members = users_df['team_number'].value_counts().reindex(scope_teams, fill_value=0)
+        standups_today = today_standups['team_number'].value_counts().reindex(scope_teams, fill_value=0)
+        doubts_open = open_doubts['team_number'].value_counts().reindex(scope_teams, fill_value=0)
+        
+        team_stats = pd.DataFrame({
+            'Team': [f"Team {team_id}" for team_id in scope_teams],
+            'Organization': [registry.teams[team_id]['org'] for team_id in scope_teams],
+            'Department': [registry.teams[team_id]['department'] for team_id in scope_teams],
+            'Members': members.values,
+            'Today Standups': standups_today.values,
+            'Open Doubts': doubts_open.values
+        })
+        
+        st.dataframe(team_stats, use_container_width=True)
+    
+    with tab5:
+        st.subheader("🚧 Blocker Trends")
+        
+        # Clusters are precomputed by the background worker; this tab only reads them
+        worker = get_blocker_worker()
+        if not worker.ready:
+            st.info("⏳ Blocker clusters are still being built from past standups...")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            trend_date = st.date_input("Date", value=date.today(), key="blocker_trend_date")
+        with col2:
+            trend_scope = st.radio("Group by", ["Day", "Week"], horizontal=True, key="blocker_trend_scope")
+        
+        day_period, week_period = blocker_periods(trend_date.isoformat())
+        clusters = worker.summarize(day_period[0] if trend_scope == "Day" else week_period[0])
+        
+        if clusters:
+            shared = [cluster for cluster in clusters if len(cluster['teams']) > 1]
+            if shared:
+                st.warning(f"⚠️ {len(shared)} blocker theme(s) are affecting more than one team")
             
-            team_stats.append({
-                'Team': f"Team {team_id}",
-                'Members': len(team_users),
-                'Today Standups': len(team_standups_today),
-                'Open Doubts': len(team_open_doubts)
-            })
+            for cluster in clusters:
+                teams = ", ".join(f"Team {team}" for team in cluster['teams'])
+                with st.expander(f"{cluster['theme']} - {cluster['mentions']} mention(s) ({teams})"):
+                    st.write(f"**People:** {', '.join(cluster['people'])}")
+                    for example in cluster['examples']:
+                        st.write(f"- {example}")
+        else:
+            st.info("No blockers reported for this period.")
         
-        st.dataframe(pd.DataFrame(team_stats), use_container_width=True)
+        # Blockers the same team raised on several days of the week
+        st.markdown("---")
+        st.subheader("🔁 Recurring Blockers This Week")
+        recurring = [
+            {'Team': f"Team {team}", 'Blocker Theme': cluster['theme'], 'Mentions': cluster['mentions']}
+            for cluster in worker.summarize(week_period[0])
+            for team in cluster['recurring_teams']
+        ]
+        if recurring:
+            st.dataframe(pd.DataFrame(recurring), use_container_width=True)
+        else:
+            st.info("No recurring blockers this week.")
+    
+    # Query cache effectiveness across all sessions
+    with st.expander("⚙️ Query Cache Stats"):
+        cache_stats = get_query_cache().stats()
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Hits", cache_stats['hits'])
+        with col2:
+            st.metric("Misses", cache_stats['misses'])
+        with col3:
+            st.metric("Hit Rate", f"{cache_stats['hit_rate']:.0%}")
+        with col4:
+            st.metric("Evictions", cache_stats['evictions'])
+        st.write(
+            f"{cache_stats['entries']} cached results using "
+            f"{cache_stats['used_bytes'] / 2 ** 20:.1f} MB of {cache_stats['max_bytes'] / 2 ** 20:.0f} MB"
+        )
     
     # Logout button
     if st.button("🔓 Logout", key="lead_logout"):
-        st.session_state.lead_authenticated = False
+        user = st.session_state.user_data
+        start_session(user, lead_team=user.team_number if user.is_tech_lead else None)
         st.rerun()
 
 def main():
@@ -788,8 +1890,9 @@ def main():
         initial_sidebar_state="expanded"
     )
     
-    # Initialize CSV files
-    init_csv_files()
+    # Initialize CSV files and start warming caches, once per server process
+    init_storage()
+    start_cache_warmer()
     
     # Initialize session state
     if 'logged_in' not in st.session_state:
@@ -797,6 +1900,11 @@ def main():
     if 'user_data' not in st.session_state:
         st.session_state.user_data = None
     
+    # A cheap signature check replaces re-verifying credentials on every rerun
+    if st.session_state.logged_in and verify_session_token(st.session_state.get('auth_token')) is None:
+        st.session_state.logged_in = False
+        st.session_state.user_data = None
+    
     # Check if user is logged in
     if not st.session_state.logged_in:
         user_registration_page()
@@ -804,17 +1912,24 @@ def main():
     
     # Sidebar navigation for logged-in users
     st.sidebar.title("🚀 Navigation")
-    st.sidebar.markdown(f"**Welcome:** {st.session_state.user_data['name']}")
-    st.sidebar.markdown(f"**Team:** {st.session_state.user_data['team_number']}")
+    st.sidebar.markdown(f"**Welcome:** {st.session_state.user_data.name}")
+    st.sidebar.markdown(f"**Team:** {st.session_state.user_data.team_number}")
     
     # Show role if tech lead
-    if st.session_state.user_data.get('is_tech_lead', False):
+    if st.session_state.user_data.is_tech_lead:
         st.sidebar.markdown("**Role:** 👥 Tech Lead")
+    else:
+        # Unread reply badge, counted from change feed events without reading doubts.
+        # Its slot is filled after page routing so the doubts page can mark replies read first.
+        user_id = st.session_state.user_data.user_id
+        sync_unread_replies(user_id)
+        badge_slot = st.sidebar.empty()
+        watch_change_feed('replies_seq', lambda event: event.user_id == user_id)
     
     st.sidebar.markdown("---")
     
     # Different navigation options based on role
-    if st.session_state.user_data.get('is_tech_lead', False):
+    if st.session_state.user_data.is_tech_lead:
         page = st.sidebar.selectbox(
             "Choose a page:",
             ["👥 Tech Lead Dashboard"]
@@ -840,6 +1955,11 @@ def main():
         change_team_page()
     elif page == "👥 Tech Lead Dashboard":
         team_lead_dashboard()
+    
+    if not st.session_state.user_data.is_tech_lead:
+        unread_count = len(st.session_state.unread_replies)
+        if unread_count:
+            badge_slot.markdown(f"🔔 **{unread_count} new repl{'y' if unread_count == 1 else 'ies'}** to your doubts")
 
 if __name__ == "__main__":
     main()